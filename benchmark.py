@@ -0,0 +1,169 @@
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from checkers.board import Board
+from checkers.bitboard import BitBoard
+from checkers.constants import RED, WHITE
+from checkers.move_tables import perft
+from checkers.positions import POSITIONS, board_from_layout
+from minimax.algo import minimax_in_place
+from minimax.algorithm import alpha_beta_in_place, get_all_moves
+from minimax.ga_minimax import GA_minimax_in_place
+from minimax.genetic_algorithm import get_optimized_evaluation_function, DEFAULT_PARAMS
+from minimax.iterative import SearchBudget
+
+# Engine benchmarks: perft counts and speed for both board classes, nodes/sec
+# and time to depth for the searches, and fuzzy move latency.
+# Usage: python benchmark.py [--output results.json] [--compare baseline.json]
+
+PERFT_DEPTHS = {'start': 4, 'midgame': 4, 'midgame2': 4, 'endgame': 4}
+REFERENCE_DEPTH = 2  # perft through get_all_pieces/get_valid_moves/get_all_moves, which copies every board
+SEARCH_POSITIONS = ('start', 'midgame')
+INFINITY = float('inf')
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def timed(function, repeat):
+    # Best of repeat runs, with the value of the last one
+    best = INFINITY
+    for _ in range(repeat):
+        random.seed(0)
+        start = time.perf_counter()
+        value = function()
+        best = min(best, time.perf_counter() - start)
+    return value, best
+
+
+def reference_perft(board, color, depth):
+    """perft through the Board API the UI uses, to check the fast move generators against."""
+    if depth == 0:
+        return 1
+    if board.winner() is not None:
+        return 0
+    other = RED if color == WHITE else WHITE
+    return sum(reference_perft(child, other, depth - 1) for child in get_all_moves(board, color, None))
+
+
+def bench_perft(results, quick, repeat):
+    for name, (layout, color) in POSITIONS.items():
+        reference = reference_perft(board_from_layout(layout, BitBoard), color, REFERENCE_DEPTH)
+        for board_class in (Board, BitBoard):
+            board = board_from_layout(layout, board_class)
+            for depth in range(1, PERFT_DEPTHS[name] - quick + 1):
+                nodes, seconds = timed(lambda: perft(board, color, depth), repeat if depth < 4 else 1)
+                results['perft'][f'{name}/{board_class.__name__}/d{depth}'] = {'nodes': nodes, 'seconds': seconds}
+                if depth == REFERENCE_DEPTH and nodes != reference:
+                    results['errors'].append(f"perft {name} {board_class.__name__} depth {depth}: {nodes}, get_all_moves gives {reference}")
+
+
+def bench_search(results, quick, repeat):
+    evaluation_function = get_optimized_evaluation_function(DEFAULT_PARAMS)
+
+    def ga(board, depth, budget):
+        evaluation_function(board)
+        return GA_minimax_in_place(board, depth, -INFINITY, INFINITY, True, evaluation_function, budget=budget)
+
+    engines = {
+        'minimax': (lambda board, depth, budget: minimax_in_place(board, depth, True, budget=budget), 3),
+        'alpha_beta': (lambda board, depth, budget: alpha_beta_in_place(board, depth, -INFINITY, INFINITY, True, budget=budget), 5),
+        'GA_minimax': (ga, 4),
+    }
+    for engine, (search, max_depth) in engines.items():
+        for name in SEARCH_POSITIONS:
+            layout, _ = POSITIONS[name]
+            for depth in range(1, max_depth - quick + 1):
+                board = board_from_layout(layout, BitBoard)
+
+                def run():
+                    budget = SearchBudget()
+                    search(board, depth, budget)
+                    return budget.nodes
+                nodes, seconds = timed(run, repeat)
+                results['search'][f'{engine}/{name}/d{depth}'] = {'nodes': nodes, 'seconds': seconds, 'nps': round(nodes / seconds)}
+
+
+def bench_fuzzy(results, repeat):
+    from minimax.fuzzy import determine_best_fuzzy_move, COLD_FIRST_MOVE
+    # The first move a player sees, in a fresh process where nothing is cached yet
+    first = min(float(subprocess.run([sys.executable, '-c', COLD_FIRST_MOVE], cwd=ROOT, capture_output=True,
+                                     text=True, check=True).stdout) for _ in range(repeat))
+    results['fuzzy']['first_move'] = {'seconds': first}
+    for name in SEARCH_POSITIONS:
+        board = board_from_layout(POSITIONS[name][0], BitBoard)
+        # Later moves, once the position's inputs have been through skfuzzy
+        determine_best_fuzzy_move(board)
+        _, seconds = timed(lambda: [determine_best_fuzzy_move(board) for _ in range(20)], repeat)
+        results['fuzzy'][name] = {'seconds': seconds / 20}
+
+
+def run(quick=False, repeat=3):
+    results = {
+        'meta': {'python': platform.python_version(), 'machine': platform.machine(), 'time': time.time(), 'quick': quick},
+        'perft': {}, 'search': {}, 'fuzzy': {}, 'errors': [],
+    }
+    bench_perft(results, int(quick), repeat)
+    bench_search(results, int(quick), repeat)
+    bench_fuzzy(results, repeat)
+    return results
+
+
+def compare(results, baseline, tolerance=0.25, min_seconds=0.05):
+    """Lines describing the differences from baseline, and whether any of them is a regression."""
+    lines, regressed = [], False
+    for section in ('perft', 'search', 'fuzzy'):
+        for key, base in baseline.get(section, {}).items():
+            new = results[section].get(key)
+            if new is None:
+                continue
+            if 'nodes' in base and new['nodes'] != base['nodes']:
+                # A perft count can only change if move generation broke; node counts change with ordering
+                lines.append(f"{section} {key}: {base['nodes']} -> {new['nodes']} nodes")
+                regressed |= section == 'perft'
+            # Too short to time reliably, unless it has since grown past min_seconds
+            if max(base['seconds'], new['seconds']) >= min_seconds:
+                ratio = new['seconds'] / base['seconds']
+                if ratio > 1 + tolerance or ratio < 1 - tolerance:
+                    lines.append(f"{section} {key}: {base['seconds']:.4f}s -> {new['seconds']:.4f}s ({ratio:.2f}x)")
+                    regressed |= ratio > 1 + tolerance
+    return lines, regressed
+
+
+def report(results):
+    for key, entry in results['perft'].items():
+        print(f"perft  {key:28} {entry['nodes']:>9} nodes {entry['seconds']:8.4f}s")
+    for key, entry in results['search'].items():
+        print(f"search {key:28} {entry['nodes']:>9} nodes {entry['seconds']:8.4f}s {entry['nps']:>9} nodes/s")
+    for key, entry in results['fuzzy'].items():
+        print(f"fuzzy  {key:28} {entry['seconds'] * 1000:.3f} ms per move")
+    for error in results['errors']:
+        print(f"ERROR: {error}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark move generation and the search engines.')
+    parser.add_argument('--output', help='write the results here as JSON')
+    parser.add_argument('--compare', help='baseline JSON from an earlier --output to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='relative slowdown that counts as a regression')
+    parser.add_argument('--repeat', type=int, default=3, help='timings are the best of this many runs')
+    parser.add_argument('--quick', action='store_true', help='one ply less everywhere')
+    args = parser.parse_args()
+
+    results = run(args.quick, args.repeat)
+    report(results)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    failed = bool(results['errors'])
+    if args.compare:
+        with open(args.compare) as f:
+            lines, regressed = compare(results, json.load(f), args.tolerance)
+        print(f"\ncompared with {args.compare}:")
+        for line in lines or ['no differences beyond tolerance']:
+            print(f"  {line}")
+        failed |= regressed
+    sys.exit(1 if failed else 0)
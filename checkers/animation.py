@@ -0,0 +1,180 @@
+import os
+import queue
+import struct
+import threading
+import zlib
+from functools import lru_cache
+import pygame
+
+# Winner-screen GIFs, decoded and scaled on a background thread and handed to
+# the UI a frame at a time. Frames are kept zlib-compressed, in memory and
+# optionally on disk, so later games and later runs skip decoding and resizing.
+#
+# Disk cache layout: a header (magic, format version, the source file's mtime
+# and size, frame width and height, frame count), then per frame its
+# compressed length (u32) and the zlib-compressed RGB bytes.
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'gif_frames')
+MAGIC = b'GIFC'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<4sHqqHHI')
+LENGTH = struct.Struct('<I')
+# Frames the loader may get ahead of the UI, so collected frames never pile up in the queue
+READ_AHEAD = 8
+
+
+class GifAnimation:
+    """The frames of a GIF scaled to size, streamed in by a background thread.
+
+    Call update() once per UI frame to collect the frames that have arrived,
+    so the first one is up almost at once. frames holds them zlib-compressed
+    (50-110 KB per 800x800 frame, 10.3 MB for both winner GIFs).
+
+    A frame is converted to display format each time it is shown, not once
+    overall: frame() decompresses and converts only the frame on screen,
+    4-6 ms out of the 83 ms a frame lasts at 12 frames per second. Keeping
+    every frame converted would take 2.5 MB each, about 330 MB for both GIFs
+    for the rest of the run. A smaller set of converted frames would not
+    help, because the animation loops through all of them before any repeats.
+    """
+
+    def __init__(self, filename, size, cache_dir=CACHE_DIR):
+        self.filename = filename
+        self.size = size
+        self.cache_path = os.path.join(cache_dir, f'{os.path.basename(filename)}.{size[0]}x{size[1]}.bin') if cache_dir else None
+        self.frames = []
+        self.loaded = False
+        self.shown = None  # (index, surface) of the last frame converted
+        self.error = None
+        self.pending = queue.Queue(READ_AHEAD)
+        threading.Thread(target=self._load, daemon=True).start()
+
+    def update(self):
+        while not self.loaded:
+            try:
+                data = self.pending.get_nowait()
+            except queue.Empty:
+                break
+            if data is None:
+                self.loaded = True
+            elif isinstance(data, Exception):
+                # Keep whatever frames arrived; the screen works without the rest
+                self.error, self.loaded = data, True
+            else:
+                self.frames.append(data)
+        return self
+
+    def frame(self, index):
+        # The display-format surface for frame index, converted again on every pass of the loop
+        if self.shown is None or self.shown[0] != index:
+            data = zlib.decompress(self.frames[index])
+            self.shown = index, pygame.image.frombuffer(data, self.size, 'RGB').convert()
+        return self.shown[1]
+
+    def next_index(self, index):
+        # Hold the current frame while the next one is still loading
+        if index + 1 < len(self.frames):
+            return index + 1
+        return 0 if self.loaded else index
+
+    def _load(self):
+        try:
+            frames = self._read_cache()
+            if frames is None:
+                frames = self._decode()
+            for data in frames:
+                self.pending.put(data)
+        except Exception as error:
+            self.pending.put(error)
+            return
+        self.pending.put(None)
+
+    def _source_stamp(self):
+        stat = os.stat(self.filename)
+        return stat.st_mtime_ns, stat.st_size
+
+    def _read_cache(self):
+        # Frames from the disk cache, or None if there is no cache file for this source and size
+        if self.cache_path is None:
+            return None
+        try:
+            f = open(self.cache_path, 'rb')
+        except OSError:
+            return None
+        header = f.read(HEADER.size)
+        if len(header) != HEADER.size:
+            f.close()
+            return None
+        magic, version, mtime, file_size, width, height, count = HEADER.unpack(header)
+        if (magic, version, (mtime, file_size), (width, height)) != (MAGIC, FORMAT_VERSION, self._source_stamp(), self.size):
+            f.close()
+            return None
+        return self._cached_frames(f, count)
+
+    def _cached_frames(self, f, count):
+        with f:
+            for _ in range(count):
+                length, = LENGTH.unpack(f.read(LENGTH.size))
+                yield f.read(length)
+
+    def _decode(self):
+        # imageio and PIL are only needed the first time a GIF is shown
+        import imageio
+        from PIL import Image
+        stamp = self._source_stamp()
+        compressed = []
+        for frame in imageio.get_reader(self.filename):
+            image = Image.fromarray(frame).convert('RGB').resize(self.size, resample=Image.BILINEAR)
+            data = zlib.compress(image.tobytes(), 1)
+            compressed.append(data)
+            yield data
+        if self.cache_path is not None:
+            self._write_cache(stamp, compressed)
+
+    def _write_cache(self, stamp, compressed):
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        temp_path = f'{self.cache_path}.{os.getpid()}.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, FORMAT_VERSION, *stamp, *self.size, len(compressed)))
+            for data in compressed:
+                f.write(LENGTH.pack(len(data)))
+                f.write(data)
+        os.replace(temp_path, self.cache_path)
+
+
+@lru_cache(maxsize=None)
+def get_animation(filename, size, cache_dir=CACHE_DIR):
+    """The GifAnimation for filename at size, shared by every game in this run."""
+    return GifAnimation(filename, size, cache_dir)
+
+
+if __name__ == '__main__':
+    # Time to first frame and to all frames: decoding, from the disk cache, and from memory
+    import time
+    import tempfile
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    from .constants import WIDTH, HEIGHT
+
+    pygame.init()
+    pygame.display.set_mode((WIDTH, HEIGHT))
+
+    def play(animation):
+        start = time.perf_counter()
+        first = None
+        while True:
+            animation.update()
+            if first is None and animation.frames:
+                first = time.perf_counter() - start
+            if animation.loaded:
+                return first, time.perf_counter() - start
+            time.sleep(0.001)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for filename in ('win.gif', 'lose.gif'):
+            for run in ('decode', 'disk cache'):
+                first, total = play(GifAnimation(filename, (WIDTH, HEIGHT), cache_dir))
+                print(f"{filename} {run}: first frame {first * 1000:.0f} ms, all frames {total * 1000:.0f} ms")
+            animation = get_animation(filename, (WIDTH, HEIGHT), cache_dir)
+            play(animation)
+            first, total = play(get_animation(filename, (WIDTH, HEIGHT), cache_dir))
+            print(f"{filename} next game: all {len(animation.frames)} frames in {total * 1000:.2f} ms")
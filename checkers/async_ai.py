@@ -0,0 +1,51 @@
+import random
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
+from minimax.iterative import SearchBudget
+
+
+class AsyncAI:
+    """Runs the AI's search on a background thread so the game loop keeps drawing frames.
+
+    start() hands the search a private copy of the board (and seeds random for
+    it, when given a seed, so the move can be replayed), poll() is called once
+    per frame and returns the new board when the search is done, and cancel()
+    abandons a running search (its result is thrown away).
+    """
+
+    def __init__(self):
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.future = None
+        self.budget = None
+
+    @property
+    def thinking(self):
+        return self.future is not None
+
+    def start(self, think, board, time_limit=None, node_limit=None, seed=None):
+        # think(board, budget) returns the board after the AI's move, or None
+        self.budget = SearchBudget(time_limit, node_limit)
+        self.future = self.executor.submit(self._run, think, deepcopy(board), self.budget, seed)
+
+    @staticmethod
+    def _run(think, board, budget, seed):
+        if seed is not None:
+            random.seed(seed)
+        return think(board, budget)
+
+    def poll(self):
+        """(True, new_board) once the search has finished, (False, None) until then."""
+        if self.future is None or not self.future.done():
+            return False, None
+        future, self.future, self.budget = self.future, None, None
+        return True, future.result()
+
+    def cancel(self):
+        if self.future is not None:
+            self.budget.cancel()
+            self.future.cancel()
+            self.future = self.budget = None
+
+    def shutdown(self):
+        self.cancel()
+        self.executor.shutdown(wait=True)
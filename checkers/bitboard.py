@@ -0,0 +1,238 @@
+from .constants import ROWS, COLS, RED, WHITE
+from .board import Board
+from .piece import Piece
+from .zobrist import ZOBRIST, compute_hash
+from .move_tables import TARGETS
+from .evaluation import PIECE_VALUES, DIAGONALS
+
+# Square (row, col) lives at bit row * COLS + col of an 81-bit int
+PIECE_TYPES = ('soldier', 'queen', 'king')
+
+# TARGETS with the target's bit instead of its row and column
+BIT_TARGETS = {
+    key: [tuple((target, 1 << target) for target, _, _ in targets) for targets in squares]
+    for key, squares in TARGETS.items()
+}
+
+
+def square_bit(row, col):
+    return 1 << (row * COLS + col)
+
+
+def row_mask(row):
+    return ((1 << COLS) - 1) << (row * COLS)
+
+
+PROMOTION_ROWS = row_mask(0) | row_mask(ROWS - 1)
+
+# Diagonal neighbours that count for evaluation.is_protected (rows and columns 0-7 only)
+PROTECTION_MASKS = [
+    sum(square_bit(row + dr, col + dc) for dr, dc in DIAGONALS
+        if 0 <= row + dr < 8 and 0 <= col + dc < 8)
+    for row in range(ROWS) for col in range(COLS)
+]
+
+
+class BitBoard(Board):
+    """Board engine that keeps one 81-bit int per (color, type) instead of a grid of Pieces.
+
+    Piece objects are only built on demand by get_piece/get_all_pieces, so the
+    engines and Game keep working against the usual Board API.
+    """
+
+    def __init__(self):
+        self.bitboards = {(color, type): 0 for color in (RED, WHITE) for type in PIECE_TYPES}
+        self.red_left = self.white_left = 13
+        self.red_kings = self.white_kings = 0
+        self.turn = WHITE
+        self.hash = 0
+        self.material = 0
+        self.weights = None
+        self.positional = 0.0
+        self.create_board()
+
+    def __deepcopy__(self, memo):
+        new_board = BitBoard.__new__(BitBoard)
+        new_board.__dict__.update(self.__dict__)
+        new_board.bitboards = dict(self.bitboards)
+        return new_board
+
+    def create_board(self):
+        # Every other square, the same pattern Board.create_board fills
+        for row, type, color in ((0, 'king', WHITE), (1, 'queen', WHITE), (2, 'soldier', WHITE),
+                                 (6, 'soldier', RED), (7, 'queen', RED), (8, 'king', RED)):
+            for col in range(COLS):
+                if col % 2 == ((row + 1) % 2):
+                    self.bitboards[(color, type)] |= square_bit(row, col)
+        self.hash = compute_hash(self)
+        self.material = self.full_evaluate()
+
+    def load_position(self, pieces):
+        self.bitboards = {key: 0 for key in self.bitboards}
+        for row, col, type, color in pieces:
+            self.bitboards[(color, type)] |= square_bit(row, col)
+        self._position_loaded()
+
+    @property
+    def board(self):
+        grid = [[0] * COLS for _ in range(ROWS)]
+        for piece in self.get_all_pieces(WHITE) + self.get_all_pieces(RED):
+            grid[piece.row][piece.col] = piece
+        return grid
+
+    def occupied(self, color):
+        bb = self.bitboards
+        return bb[(color, 'soldier')] | bb[(color, 'queen')] | bb[(color, 'king')]
+
+    def full_evaluate(self):
+        bb = self.bitboards
+        score = 0
+        for type, value in PIECE_VALUES.items():
+            score += value * (bb[(WHITE, type)].bit_count() - bb[(RED, type)].bit_count())
+        return score
+
+    def get_all_pieces(self, color):
+        pieces = []
+        occupied = self.occupied(color)
+        while occupied:
+            low = occupied & -occupied
+            square = low.bit_length() - 1
+            pieces.append(self._make_piece(square // COLS, square % COLS, low, color))
+            occupied ^= low
+        return pieces
+
+    def _make_piece(self, row, col, bit, color):
+        for type in PIECE_TYPES:
+            if self.bitboards[(color, type)] & bit:
+                return Piece(row, col, type, color)
+        return 0
+
+    def get_piece(self, row, col):
+        bit = square_bit(row, col)
+        for color in (WHITE, RED):
+            if self.occupied(color) & bit:
+                return self._make_piece(row, col, bit, color)
+        return 0
+
+    def move(self, piece, row, col):
+        if piece:
+            target = row * COLS + col
+            if (self.occupied(RED) | self.occupied(WHITE)) & (1 << target):
+                # Remove the captured piece
+                self.remove([self.get_piece(row, col)])
+            promoted = self._move_square(piece.color, piece.type, piece.row * COLS + piece.col, target)
+            piece.move(row, col)
+            if promoted:
+                piece.make_king()
+
+    def make_move(self, move):
+        origin, target, captured = move
+        undo = (dict(self.bitboards), self.hash, self.material, self.weights, self.positional, self.red_left, self.white_left, self.red_kings, self.white_kings)
+        bit = 1 << origin
+        for (color, type), bits in self.bitboards.items():
+            if bits & bit:
+                break
+        if captured is not None:
+            self._remove_square(RED if color == WHITE else WHITE, captured, target)
+        self._move_square(color, type, origin, target)
+        return undo
+
+    def unmake_move(self, undo):
+        self.bitboards, self.hash, self.material, self.weights, self.positional, self.red_left, self.white_left, self.red_kings, self.white_kings = undo
+
+    def _move_square(self, color, type, origin, target):
+        # Move the piece on origin to the empty target square; True if it was promoted
+        around = self._protection_area(divmod(origin, COLS), divmod(target, COLS))
+        protection_before = self._protection(around)
+        self._update_square_score(color, type, origin, -1)
+        self.bitboards[(color, type)] ^= (1 << origin) | (1 << target)
+        self.hash ^= ZOBRIST[(color, type)][origin] ^ ZOBRIST[(color, type)][target]
+
+        promoted = (1 << target) & PROMOTION_ROWS
+        if promoted:
+            self.bitboards[(color, type)] ^= 1 << target
+            self.bitboards[(color, 'king')] |= 1 << target
+            self.hash ^= ZOBRIST[(color, type)][target] ^ ZOBRIST[(color, 'king')][target]
+            type = 'king'
+            if color == WHITE:
+                self.white_kings += 1
+            else:
+                self.red_kings += 1
+        self._update_square_score(color, type, target, 1)
+        self.positional += self._protection(around) - protection_before
+        return promoted
+
+    def _remove_square(self, color, type, square):
+        around = self._protection_area(divmod(square, COLS))
+        protection_before = self._protection(around)
+        self.bitboards[(color, type)] &= ~(1 << square)
+        self.hash ^= ZOBRIST[(color, type)][square]
+        self._update_square_score(color, type, square, -1)
+        self.positional += self._protection(around) - protection_before
+
+        if color == RED:
+            self.red_left -= 1
+        else:
+            self.white_left -= 1
+
+    def _protection(self, squares):
+        # Same as evaluation.protection_score, without building Piece objects
+        if not squares:
+            return 0.0
+        white, red = self.occupied(WHITE), self.occupied(RED)
+        score = 0
+        for row, col in squares:
+            square = row * COLS + col
+            bit = 1 << square
+            if white & bit and white & PROTECTION_MASKS[square]:
+                score += 1
+            elif red & bit and red & PROTECTION_MASKS[square]:
+                score -= 1
+        return score * self.weights.protection_bonus
+
+    def remove(self, pieces):
+        for piece in pieces:
+            if piece != 0:
+                self._remove_square(piece.color, piece.type, piece.row * COLS + piece.col)
+
+    def get_move_list(self, color):
+        # Compact (from, to, captured) moves from the move tables and the bitboards
+        bb = self.bitboards
+        enemy_color = RED if color == WHITE else WHITE
+        own = self.occupied(color)
+        enemy = self.occupied(enemy_color)
+        soldiers, queens = bb[(color, 'soldier')], bb[(color, 'queen')]
+        enemy_soldiers, enemy_queens = bb[(enemy_color, 'soldier')], bb[(enemy_color, 'queen')]
+        tables = {type: BIT_TARGETS[(color, type)] for type in PIECE_TYPES}
+
+        moves = []
+        pieces = own
+        while pieces:
+            low = pieces & -pieces
+            pieces ^= low
+            origin = low.bit_length() - 1
+            type = 'soldier' if soldiers & low else 'queen' if queens & low else 'king'
+            for target, bit in tables[type][origin]:
+                if bit & own:
+                    continue
+                if bit & enemy:
+                    captured = 'soldier' if enemy_soldiers & bit else 'queen' if enemy_queens & bit else 'king'
+                    moves.append((origin, target, captured))
+                else:
+                    moves.append((origin, target, None))
+        return moves
+
+    def get_valid_moves(self, piece):
+        moves = {}
+        enemy_color = RED if piece.color == WHITE else WHITE
+        own = self.occupied(piece.color)
+        enemy = self.occupied(enemy_color)
+
+        for target, bit in BIT_TARGETS[(piece.color, piece.type)][piece.row * COLS + piece.col]:
+            if not bit & own:
+                row, col = divmod(target, COLS)
+                if bit & enemy:
+                    moves[(row, col)] = [self._make_piece(row, col, bit, enemy_color)]
+                else:
+                    moves[(row, col)] = []
+        return moves
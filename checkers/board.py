@@ -1,11 +1,8 @@
-import pygame
-from pygame.locals import *
-from .constants import BLACK, ROWS, COLS, RED, SQUARE_SIZE, WHITE, GREY
+from .constants import ROWS, COLS, RED, WHITE
 from .piece import Piece
-
-pygame.init()
-pygame.mixer.init()
-
+from .zobrist import piece_key, compute_hash
+from . import evaluation
+from .move_tables import TARGETS
 
 class Board:
     def __init__(self):
@@ -13,18 +10,23 @@ class Board:
         self.red_left = self.white_left = 13
         self.red_kings = self.white_kings = 0
         self.turn = WHITE
+        self.hash = 0
+        # Running scores kept up to date by move/remove, see set_weights
+        self.material = 0
+        self.weights = None
+        self.positional = 0.0
         self.create_board()
 
-    def draw_cubes(self, win):
-        win.fill(BLACK)
-        for row in range(ROWS):
-            for col in range(row % 2, ROWS, 2):
-                pygame.draw.rect(win, WHITE, (row * SQUARE_SIZE, col * SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE))
     '''
     def evaluate(self):
         return self.white_left - self.red_left + (self.white_kings * 0.5 - self.red_kings * 0.5)
     '''
     def evaluate(self):
+        if evaluation.DEBUG:
+            evaluation.check(self)
+        return self.material
+
+    def full_evaluate(self):
         white_score = 0
         red_score = 0
 
@@ -64,22 +66,89 @@ class Board:
                 # Remove the captured piece
                 self.remove([target_piece])
             #print(f"Before move - Piece position: ({piece.row}, {piece.col}), Board state:")
+            around = self._protection_area((piece.row, piece.col), (row, col))
+            protection_before = self._protection(around)
+            self._update_score(piece, -1)
+            self.hash ^= piece_key(piece.color, piece.type, piece.row, piece.col) ^ piece_key(piece.color, piece.type, row, col)
             self.board[piece.row][piece.col] = 0  
             self.board[row][col] = piece  
             piece.move(row, col) 
             #print(f"After move - Piece position: ({piece.row}, {piece.col}), Board state:")
 
             if row == 0 or row == ROWS - 1:
+                self.hash ^= piece_key(piece.color, piece.type, row, col) ^ piece_key(piece.color, 'king', row, col)
                 piece.make_king()
                 if piece.color == WHITE:
                     self.white_kings += 1
                 else:
                     self.red_kings += 1
+            self._update_score(piece, 1)
+            self.positional += self._protection(around) - protection_before
+
+    def set_weights(self, weights):
+        # Start keeping a running positional score for these EvalWeights (None to stop)
+        self.weights = weights
+        self.positional = evaluation.full_positional(self, weights) if weights is not None else 0.0
+
+    def _update_score(self, piece, sign):
+        self._update_square_score(piece.color, piece.type, piece.row * COLS + piece.col, sign)
+
+    def _update_square_score(self, color, type, square, sign):
+        # Add (sign=1) or take away (sign=-1) the piece's material and table score
+        self.material += sign * evaluation.material_value(color, type)
+        if self.weights is not None:
+            self.positional += sign * self.weights.tables[(color, type)][square]
+
+    def _protection_area(self, *squares):
+        if self.weights is None or not self.weights.protection_bonus:
+            return ()
+        return evaluation.neighbourhood(*squares)
+
+    def _protection(self, squares):
+        if not squares:
+            return 0.0
+        return evaluation.protection_score(self, squares, self.weights.protection_bonus)
 
 
     def get_piece(self, row, col):
         return self.board[row][col]
 
+    def get_move_list(self, color):
+        # Compact (from, to, captured) moves straight from the move tables, for make_move
+        moves = []
+        cells = self.board
+        square = 0
+        for row in cells:
+            for piece in row:
+                if piece and piece.color == color:
+                    for target, target_row, target_col in TARGETS[(color, piece.type)][square]:
+                        occupant = cells[target_row][target_col]
+                        if not occupant:
+                            moves.append((square, target, None))
+                        elif occupant.color != color:
+                            moves.append((square, target, occupant.type))
+                square += 1
+        return moves
+
+    def make_move(self, move):
+        row, col = divmod(move[0], COLS)
+        to_row, to_col = divmod(move[1], COLS)
+        piece = self.board[row][col]
+        captured = self.board[to_row][to_col]
+        undo = (piece, row, col, piece.type, piece.king, captured, self.hash, self.material, self.weights, self.positional,
+                self.red_left, self.white_left, self.red_kings, self.white_kings)
+        self.move(piece, to_row, to_col)
+        return undo
+
+    def unmake_move(self, undo):
+        piece, row, col, type, king, captured, self.hash, self.material, self.weights, self.positional, \
+            self.red_left, self.white_left, self.red_kings, self.white_kings = undo
+        self.board[piece.row][piece.col] = captured
+        self.board[row][col] = piece
+        piece.type = type
+        piece.king = king
+        piece.move(row, col)
+
     def create_board(self):
         for row in range(ROWS):
             self.board.append([])
@@ -101,21 +170,36 @@ class Board:
                         self.board[row].append(0)
                 else:
                     self.board[row].append(0)
-
-    def draw(self, win):
-        self.draw_cubes(win)
-        for row in range(ROWS):
-            for col in range(COLS):
-                piece = self.board[row][col]
-                if piece != 0:
-                    piece.draw(win)
+        self.hash = compute_hash(self)
+        self.material = self.full_evaluate()
+
+    def load_position(self, pieces):
+        """Replace every piece with pieces, (row, col, type, color) tuples as from checkers.positions."""
+        self.board = [[0] * COLS for _ in range(ROWS)]
+        for row, col, type, color in pieces:
+            self.board[row][col] = Piece(row, col, type, color)
+        self._position_loaded()
+
+    def _position_loaded(self):
+        # Recount the pieces and restart the running scores for the new position
+        self.red_left = len(self.get_all_pieces(RED))
+        self.white_left = len(self.get_all_pieces(WHITE))
+        self.red_kings = self.white_kings = 0
+        self.hash = compute_hash(self)
+        self.material = self.full_evaluate()
+        self.set_weights(self.weights)
 
     def remove(self, pieces):
         
         for piece in pieces:
             if piece != 0:
+                around = self._protection_area((piece.row, piece.col))
+                protection_before = self._protection(around)
                 self.board[piece.row][piece.col] = 0
-                
+                self.hash ^= piece_key(piece.color, piece.type, piece.row, piece.col)
+                self._update_score(piece, -1)
+                self.positional += self._protection(around) - protection_before
+
                 if piece.color == RED:
                     self.red_left -= 1
                 else:
@@ -132,43 +216,10 @@ class Board:
 
     def get_valid_moves(self, piece):
         moves = {}
-        row, col = piece.row, piece.col
-
-        if piece.type == 'soldier':
-            if piece.color == RED:
-                moves.update(self._get_moves(row - 1, col, -1, piece.color))
-            else:
-                moves.update(self._get_moves(row + 1, col, 1, piece.color))
-        elif piece.type == 'queen':
-            moves.update(self._get_moves(row, col - 1, 0, piece.color))  # left
-            moves.update(self._get_moves(row, col + 1, 0, piece.color))  # right
-            if piece.color == RED:
-               moves.update(self._get_moves(row - 1, col, 0, piece.color))  # up
-            else:
-               moves.update(self._get_moves(row + 1, col, 0, piece.color))  # down
-        elif piece.type == 'king':
-            moves.update(self._get_moves(row - 1, col, 0, piece.color))  # up
-            moves.update(self._get_moves(row + 1, col, 0, piece.color))  # down
-            moves.update(self._get_moves(row, col - 1, 0, piece.color))  # left
-            moves.update(self._get_moves(row, col + 1, 0, piece.color))  # right
-            # Diagonals
-            moves.update(self._get_moves(row - 1, col - 1, 0, piece.color))  # up-left
-            moves.update(self._get_moves(row - 1, col + 1, 0, piece.color))  # up-right
-            moves.update(self._get_moves(row + 1, col - 1, 0, piece.color))  # down-left
-            moves.update(self._get_moves(row + 1, col + 1, 0, piece.color))  # down-right
-            #print(f"Valid moves for {piece.color} {piece.type} at ({row}, {col}): {moves}")  # Debugging print
-        return moves
-
-    def _get_moves(self, row, col, direction, color):
-        moves = {}
-        if 0 <= row < ROWS and 0 <= col < COLS:
+        for target, row, col in TARGETS[(piece.color, piece.type)][piece.row * COLS + piece.col]:
             current = self.board[row][col]
             if current == 0:
                 moves[(row, col)] = []
-            elif current.color != color:
+            elif current.color != piece.color:
                 moves[(row, col)] = [current]
-
-        return moves                    
-                      
-                      
-  
\ No newline at end of file
+        return moves
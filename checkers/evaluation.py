@@ -0,0 +1,80 @@
+from .constants import ROWS, COLS, RED, WHITE
+
+# Set to True to check every incremental score against a full recompute
+DEBUG = False
+
+PIECE_VALUES = {'soldier': 1, 'queen': 3, 'king': 5}
+DIAGONALS = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+
+
+class EvalWeights:
+    """Weight tables that Board can keep a running positional score for.
+
+    tables maps (color, type) to 81 per-square scores, already signed from
+    WHITE's point of view. protection_bonus is added for every piece with a
+    friendly piece on a diagonal (subtracted for RED).
+    """
+
+    def __init__(self, tables, protection_bonus=0.0):
+        self.tables = tables
+        self.protection_bonus = protection_bonus
+
+    def __deepcopy__(self, memo):
+        # Shared by every board copy, never modified after construction
+        return self
+
+
+def material_value(color, type):
+    return PIECE_VALUES[type] if color == WHITE else -PIECE_VALUES[type]
+
+
+def neighbourhood(*squares):
+    """The given squares plus their diagonal neighbours, whose protection a change can affect."""
+    around = set()
+    for row, col in squares:
+        around.add((row, col))
+        for dr, dc in DIAGONALS:
+            if 0 <= row + dr < ROWS and 0 <= col + dc < COLS:
+                around.add((row + dr, col + dc))
+    return around
+
+
+def is_protected(board, piece):
+    """Check if a piece is protected by another piece."""
+    row, col = piece.row, piece.col
+    for dr, dc in DIAGONALS:
+        r, c = row + dr, col + dc
+        # Only rows and columns 0-7 count, as in the original GA evaluation
+        if 0 <= r < 8 and 0 <= c < 8:
+            neighbor = board.get_piece(r, c)
+            if neighbor != 0 and neighbor.color == piece.color:
+                return True
+    return False
+
+
+def protection_score(board, squares, bonus):
+    score = 0.0
+    for row, col in squares:
+        piece = board.get_piece(row, col)
+        if piece != 0 and is_protected(board, piece):
+            score += bonus if piece.color == WHITE else -bonus
+    return score
+
+
+def full_positional(board, weights):
+    score = 0.0
+    for color in (WHITE, RED):
+        for piece in board.get_all_pieces(color):
+            score += weights.tables[(piece.color, piece.type)][piece.row * COLS + piece.col]
+            if weights.protection_bonus and is_protected(board, piece):
+                score += weights.protection_bonus if piece.color == WHITE else -weights.protection_bonus
+    return score
+
+
+def check(board):
+    """Compare the running scores with a full recompute (used when DEBUG is set)."""
+    material = board.full_evaluate()
+    assert board.material == material, f"incremental material {board.material} != {material}"
+    if board.weights is not None:
+        positional = full_positional(board, board.weights)
+        assert abs(board.positional - positional) < 1e-6, f"incremental positional {board.positional} != {positional}"
@@ -1,28 +1,20 @@
-import pygame
-from pygame.locals import *
 from .board import Board
-from .constants import RED, WHITE, BLUE, SQUARE_SIZE, GREY
-from minimax.fuzzy import calculate_fuzzy_move,determine_best_fuzzy_move
-
-pygame.init()
-pygame.mixer.init()
+from .constants import RED, WHITE, COLS
+from .record import find_move
 
 
 class Game:
-    def __init__(self, win):
+    # Turn, selection and move history; checkers.render draws it
+    def __init__(self, board_class=Board):
+        self.board_class = board_class
         self._init()
-        self.win = win
-
-    def update(self):
-        self.board.draw(self.win)
-        self.draw_valid_moves(self.valid_moves)
-        pygame.display.update()
 
     def _init(self):
         self.selected = None
-        self.board = Board()
+        self.board = self.board_class()
         self.turn = RED
         self.valid_moves = {}
+        self.moves = []  # (from, to, captured type) per ply, for checkers.record
 
     def winner(self):
         if self.board.winner() == WHITE:
@@ -56,6 +48,8 @@ class Game:
         piece = self.board.get_piece(row, col)
         if self.selected and (row, col) in self.valid_moves:
             target = self.board.get_piece(row, col)
+            captured = target.type if target != 0 and target.color != self.selected.color else None
+            self.moves.append((self.selected.row * COLS + self.selected.col, row * COLS + col, captured))
             if target != 0 and target.color != self.selected.color:
               self.board.remove([target])
             self.board.move(self.selected, row, col)
@@ -64,11 +58,6 @@ class Game:
             return False
         return True
 
-    def draw_valid_moves(self, moves):
-        for move in moves:
-            row, col = move
-            pygame.draw.circle(self.win, BLUE, (col * SQUARE_SIZE + SQUARE_SIZE // 2, row * SQUARE_SIZE + SQUARE_SIZE // 2), 15)
-
     def change_turn(self):
         self.valid_moves = {}
         if self.turn == RED:
@@ -80,13 +69,14 @@ class Game:
         return self.board
 
     def ai_move(self, board):
+        self.moves.append(find_move(self.board, self.turn, board))
         self.board = board
         self.change_turn()
 
     
             
     def ai_fuzzy_move(self):
+        from minimax.fuzzy import determine_best_fuzzy_move
         new_board = determine_best_fuzzy_move(self.board)
         if new_board:
-            self.board = new_board
-            self.change_turn()
\ No newline at end of file
+            self.ai_move(new_board)
\ No newline at end of file
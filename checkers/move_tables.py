@@ -0,0 +1,74 @@
+from .constants import ROWS, COLS, RED, WHITE
+
+# Squares are numbered row * COLS + col. Search moves are (from, to, captured)
+# tuples, where captured is the type of the piece taken on `to` or None.
+
+# Directions in the order Board.get_valid_moves has always visited them
+UP, DOWN, LEFT, RIGHT = (-1, 0), (1, 0), (0, -1), (0, 1)
+UP_LEFT, UP_RIGHT, DOWN_LEFT, DOWN_RIGHT = (-1, -1), (-1, 1), (1, -1), (1, 1)
+DIRECTIONS = {
+    (RED, 'soldier'): (UP,),
+    (WHITE, 'soldier'): (DOWN,),
+    (RED, 'queen'): (LEFT, RIGHT, UP),
+    (WHITE, 'queen'): (LEFT, RIGHT, DOWN),
+    (RED, 'king'): (UP, DOWN, LEFT, RIGHT, UP_LEFT, UP_RIGHT, DOWN_LEFT, DOWN_RIGHT),
+    (WHITE, 'king'): (UP, DOWN, LEFT, RIGHT, UP_LEFT, UP_RIGHT, DOWN_LEFT, DOWN_RIGHT),
+}
+
+
+def _targets(row, col, directions):
+    targets = []
+    for dr, dc in directions:
+        r, c = row + dr, col + dc
+        if 0 <= r < ROWS and 0 <= c < COLS:
+            targets.append((r * COLS + c, r, c))
+    return tuple(targets)
+
+
+# TARGETS[(color, type)][square]: (target square, row, col) for every on-board step
+TARGETS = {
+    key: [_targets(row, col, directions) for row in range(ROWS) for col in range(COLS)]
+    for key, directions in DIRECTIONS.items()
+}
+
+
+def square(row, col):
+    return row * COLS + col
+
+
+def perft(board, color, depth):
+    """Number of move sequences of length depth for color to move, via make/unmake."""
+    if depth == 0:
+        return 1
+    if board.winner() is not None:
+        return 0
+    moves = board.get_move_list(color)
+    if depth == 1:
+        return len(moves)
+    other = RED if color == WHITE else WHITE
+    nodes = 0
+    for move in moves:
+        undo = board.make_move(move)
+        nodes += perft(board, other, depth - 1)
+        board.unmake_move(undo)
+    return nodes
+
+
+if __name__ == '__main__':
+    # Perft counts and move generation speed from the start position
+    import time
+    from checkers.board import Board
+    from checkers.bitboard import BitBoard
+
+    for board_class in (Board, BitBoard):
+        board = board_class()
+        start = time.perf_counter()
+        for _ in range(3000):
+            board.get_move_list(WHITE)
+        per_position = (time.perf_counter() - start) / 3000
+        print(f"{board_class.__name__}: {per_position * 1e6:.1f}us per get_move_list")
+        for depth in range(1, 5):
+            start = time.perf_counter()
+            nodes = perft(board, WHITE, depth)
+            elapsed = time.perf_counter() - start
+            print(f"  perft({depth}) = {nodes} in {elapsed:.3f}s")
@@ -0,0 +1,84 @@
+from .constants import ROWS, COLS, RED, WHITE
+from .board import Board
+
+# Positions as nine strings of nine squares: S/Q/K for WHITE soldier/queen/king,
+# s/q/k for RED, '.' for an empty square. Row 0 is WHITE's back row.
+LETTERS = {(WHITE, 'soldier'): 'S', (WHITE, 'queen'): 'Q', (WHITE, 'king'): 'K',
+           (RED, 'soldier'): 's', (RED, 'queen'): 'q', (RED, 'king'): 'k'}
+PIECES = {letter: key for key, letter in LETTERS.items()}
+
+
+def parse(layout):
+    """(row, col, type, color) for every piece in layout."""
+    if len(layout) != ROWS or any(len(line) != COLS for line in layout):
+        raise ValueError(f"a layout needs {ROWS} rows of {COLS} squares")
+    pieces = []
+    for row, line in enumerate(layout):
+        for col, letter in enumerate(line):
+            if letter != '.':
+                color, type = PIECES[letter]
+                pieces.append((row, col, type, color))
+    return pieces
+
+
+def board_from_layout(layout, board_class=Board):
+    board = board_class()
+    board.load_position(parse(layout))
+    return board
+
+
+def layout(board):
+    """The board as a layout, the inverse of board_from_layout."""
+    return tuple(''.join(LETTERS[(piece.color, piece.type)] if piece else '.' for piece in row) for row in board.board)
+
+
+START = (
+    '.K.K.K.K.',
+    'Q.Q.Q.Q.Q',
+    '.S.S.S.S.',
+    '.........',
+    '.........',
+    '.........',
+    '.s.s.s.s.',
+    'q.q.q.q.q',
+    '.k.k.k.k.',
+)
+
+# Fixed positions for benchmarks and tests, with the side to move.
+# The midgames and the endgame come from self-play between alpha-beta and random moves.
+POSITIONS = {
+    'start': (START, WHITE),
+    'midgame': ((
+        '...K.K..K',
+        'QQ......K',
+        '.SQS.Q...',
+        '.........',
+        '...s.....',
+        'q...k..s.',
+        'qsk..s..q',
+        '..kq.....',
+        '......k..',
+    ), WHITE),
+    'midgame2': ((
+        '.K...K..K',
+        '.Q.Q.KQ..',
+        '.........',
+        '.S.S.....',
+        '.........',
+        '...sqs.s.',
+        '.........',
+        '.q.kkqkq.',
+        '.......k.',
+    ), WHITE),
+    'endgame': ((
+        '......K..',
+        '.K.......',
+        '.........',
+        '.k.......',
+        '.........',
+        '.....s.qq',
+        '.........',
+        '.........',
+        '.......k.',
+    ), WHITE),
+}
@@ -0,0 +1,104 @@
+import base64
+import json
+import os
+from .bitboard import BitBoard
+from .constants import RED, WHITE
+
+# Game records: the moves of a game, as two bytes per move (from square, to
+# square) in base64, plus the seed the AI's randomness was drawn from at each
+# of its moves, so any position can be rebuilt and its search run again.
+#
+# A records file holds one JSON object per line:
+# {"version", "difficulty", "seed", "moves", "searches", "result"}, where
+# searches has one {"ply", "source", "depth"} per AI move.
+
+RECORDS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'game_records.jsonl')
+FORMAT_VERSION = 1
+
+
+def find_move(board, color, new_board):
+    """The move of color that turns board into new_board."""
+    for move in board.get_move_list(color):
+        undo = board.make_move(move)
+        found = board.hash == new_board.hash
+        board.unmake_move(undo)
+        if found:
+            return move
+    raise ValueError("no legal move leads to that board")
+
+
+def encode_moves(moves):
+    return base64.b64encode(bytes(square for move in moves for square in move[:2])).decode('ascii')
+
+
+def decode_moves(text):
+    # (from, to) pairs; the captured type comes from the board when the move is replayed
+    data = base64.b64decode(text)
+    return list(zip(data[::2], data[1::2]))
+
+
+class GameRecord:
+    """One game's moves and the seeds of the AI's searches.
+
+    The AI's move at ply p ran with random seeded by search_seed(p), so a
+    search replayed at that ply draws the same noise and tie-breaks.
+    """
+
+    def __init__(self, difficulty=None, seed=None, moves=(), searches=(), result=None):
+        self.difficulty = difficulty
+        self.seed = int.from_bytes(os.urandom(4), 'little') if seed is None else seed
+        self.moves = list(moves)
+        self.searches = list(searches)
+        self.result = result
+
+    def __len__(self):
+        return len(self.moves)
+
+    def search_seed(self, ply):
+        return self.seed + ply
+
+    def add_search(self, ply, source, depth=None):
+        self.searches.append({'ply': ply, 'source': source, 'depth': depth})
+
+    def to_dict(self):
+        return {'version': FORMAT_VERSION, 'difficulty': self.difficulty, 'seed': self.seed,
+                'moves': encode_moves(self.moves), 'searches': self.searches, 'result': self.result}
+
+    @classmethod
+    def from_dict(cls, data):
+        if data.get('version') != FORMAT_VERSION:
+            raise ValueError(f"game record version {data.get('version')} is not {FORMAT_VERSION}")
+        return cls(data['difficulty'], data['seed'], decode_moves(data['moves']), data['searches'], data['result'])
+
+    def save(self, path=RECORDS_PATH):
+        """Append the record to path as one JSON line."""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'a') as f:
+            f.write(json.dumps(self.to_dict()) + '\n')
+
+
+def load_records(path=RECORDS_PATH):
+    with open(path) as f:
+        return [GameRecord.from_dict(json.loads(line)) for line in f if line.strip()]
+
+
+def side_to_move(ply):
+    # RED moves first and the turn passes after every move
+    return RED if ply % 2 == 0 else WHITE
+
+
+def replay(record, ply=None, board_class=BitBoard):
+    """The board after the first ply moves of record (all of them by default).
+
+    Every move is checked against the legal moves of the side to move, so a
+    record from another version of the rules fails loudly instead of drifting.
+    """
+    board = board_class()
+    for index, (origin, target) in enumerate(record.moves[:ply]):
+        for move in board.get_move_list(side_to_move(index)):
+            if move[0] == origin and move[1] == target:
+                board.make_move(move)
+                break
+        else:
+            raise ValueError(f"move {index + 1} ({origin} to {target}) is not legal in the replayed position")
+    return board
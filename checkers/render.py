@@ -0,0 +1,181 @@
+from functools import lru_cache
+import pygame
+from .constants import WIDTH, HEIGHT, ROWS, COLS, SQUARE_SIZE, RED, WHITE, BLACK, BLUE, GREY
+
+# Drawing for Board, Piece and Game. The rules modules never import pygame,
+# so engines and self-play workers can use them without a display.
+
+PADDING = 15
+OUTLINE = 2
+
+
+def _converted(surface):
+    # Blits are fastest in the display's pixel format, once there is a display
+    if pygame.display.get_surface() is None:
+        return surface
+    return surface.convert_alpha() if surface.get_flags() & pygame.SRCALPHA else surface.convert()
+
+
+@lru_cache(maxsize=None)
+def piece_image(type):
+    # Loaded and scaled the first time a piece of that type is drawn
+    return pygame.transform.scale(pygame.image.load(f'{type}.png'), (SQUARE_SIZE - 10, SQUARE_SIZE - 10))
+
+
+@lru_cache(maxsize=None)
+def board_surface():
+    # The empty board, drawn once
+    surface = pygame.Surface((WIDTH, HEIGHT))
+    draw_cubes(surface)
+    return _converted(surface)
+
+
+@lru_cache(maxsize=None)
+def piece_sprite(color, type):
+    # Outline, disc and image of a piece on a transparent square, composited once per color and type
+    sprite = pygame.Surface((SQUARE_SIZE, SQUARE_SIZE), pygame.SRCALPHA)
+    center = SQUARE_SIZE // 2
+    image = piece_image(type)
+    radius = SQUARE_SIZE // 2 - PADDING
+    pygame.draw.circle(sprite, GREY, (center, center), radius + OUTLINE)
+    pygame.draw.circle(sprite, color, (center, center), radius)
+    sprite.blit(image, (center - image.get_width() // 2, center - image.get_height() // 2))
+    return _converted(sprite)
+
+
+def square_center(row, col):
+    return SQUARE_SIZE * col + SQUARE_SIZE // 2, SQUARE_SIZE * row + SQUARE_SIZE // 2
+
+
+def square_rect(row, col):
+    return pygame.Rect(SQUARE_SIZE * col, SQUARE_SIZE * row, SQUARE_SIZE, SQUARE_SIZE)
+
+
+def draw_cubes(win):
+    win.fill(BLACK)
+    for row in range(ROWS):
+        for col in range(row % 2, ROWS, 2):
+            pygame.draw.rect(win, WHITE, (row * SQUARE_SIZE, col * SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE))
+
+
+def draw_piece(win, piece):
+    win.blit(piece_sprite(piece.color, piece.type), (SQUARE_SIZE * piece.col, SQUARE_SIZE * piece.row))
+
+
+def draw_board(win, board):
+    win.blit(board_surface(), (0, 0))
+    for piece in board.get_all_pieces(WHITE) + board.get_all_pieces(RED):
+        draw_piece(win, piece)
+
+
+def draw_valid_moves(win, moves):
+    for row, col in moves:
+        pygame.draw.circle(win, BLUE, square_center(row, col), 15)
+
+
+def draw_game(win, game):
+    # The whole window; BoardRenderer redraws only what changed
+    draw_board(win, game.board)
+    draw_valid_moves(win, game.valid_moves)
+
+
+class BoardRenderer:
+    """Draws a Game a square at a time, redrawing only the squares that changed.
+
+    draw() returns the rects it drew over, for pygame.display.update(rects);
+    a frame where nothing changed draws nothing. The first draw, and the one
+    after invalidate(), redraws the whole window.
+    """
+
+    def __init__(self):
+        self.shown = {}  # (row, col) -> ((color, type) or None, valid move marker) as last drawn
+        self.shown_key = None
+        self.full = True
+        self.dirty = set()
+
+    def invalidate(self, rect=None):
+        """Redraw rect (every square it touches), or the whole window, on the next draw."""
+        if rect is None:
+            self.full = True
+            return
+        for row in range(ROWS):
+            for col in range(COLS):
+                if square_rect(row, col).colliderect(rect):
+                    self.dirty.add((row, col))
+
+    def draw(self, win, game):
+        board = game.board
+        # The Zobrist hash changes with every move, so an unchanged key means an unchanged picture
+        key = (id(board), board.hash, tuple(game.valid_moves))
+        if key == self.shown_key and not self.full and not self.dirty:
+            return []
+        self.shown_key = key
+
+        state = {(piece.row, piece.col): ((piece.color, piece.type), False)
+                 for piece in board.get_all_pieces(WHITE) + board.get_all_pieces(RED)}
+        for square in game.valid_moves:
+            state[square] = (state.get(square, (None, False))[0], True)
+
+        if self.full:
+            win.blit(board_surface(), (0, 0))
+            squares = state.keys()
+            rects = [win.get_rect()]
+        else:
+            squares = {square for square in state.keys() | self.shown.keys()
+                       if state.get(square) != self.shown.get(square)} | self.dirty
+            rects = [square_rect(*square) for square in squares]
+        for square in squares:
+            self._draw_square(win, square, state.get(square, (None, False)))
+        self.shown, self.full, self.dirty = state, False, set()
+        return rects
+
+    def _draw_square(self, win, square, shown):
+        piece, marked = shown
+        rect = square_rect(*square)
+        win.blit(board_surface(), rect.topleft, rect)
+        if piece is not None:
+            win.blit(piece_sprite(*piece), rect.topleft)
+        if marked:
+            pygame.draw.circle(win, BLUE, rect.center, 15)
+
+
+if __name__ == '__main__':
+    # CPU time per frame: a full redraw with a full display update, against BoardRenderer
+    import os
+    import time
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    from .bitboard import BitBoard
+    from .game import Game
+
+    FRAMES = 300
+    pygame.init()
+    window = pygame.display.set_mode((WIDTH, HEIGHT))
+
+    def frame_time(frame, game, change=None):
+        start = time.process_time()
+        for index in range(FRAMES):
+            if change is not None:
+                change(game, index)
+            frame(game)
+        return (time.process_time() - start) / FRAMES * 1000
+
+    def full_frame(game):
+        draw_game(window, game)
+        pygame.display.update()
+
+    renderer = BoardRenderer()
+
+    def dirty_frame(game):
+        rects = renderer.draw(window, game)
+        if rects:
+            pygame.display.update(rects)
+
+    def select(game, index):
+        # Alternate between two pieces, as clicking around does
+        game.select(6, 1 if index % 2 else 3)
+
+    for name, frame in (('full redraw', full_frame), ('dirty rects', dirty_frame)):
+        game = Game(BitBoard)
+        frame(game)
+        print(f"{name}: idle {frame_time(frame, game):.3f} ms, "
+              f"selection changing every frame {frame_time(frame, game, select):.3f} ms CPU per frame")
@@ -0,0 +1,25 @@
+import random
+from .constants import ROWS, COLS, RED, WHITE
+
+# Fixed seed so a position hashes the same in every process and every run
+_random = random.Random(20240601)
+
+ZOBRIST = {
+    (color, type): [_random.getrandbits(64) for _ in range(ROWS * COLS)]
+    for color in (RED, WHITE) for type in ('soldier', 'queen', 'king')
+}
+# Mixed into the key when WHITE is the side to move
+SIDE_TO_MOVE = _random.getrandbits(64)
+
+
+def piece_key(color, type, row, col):
+    return ZOBRIST[(color, type)][row * COLS + col]
+
+
+def compute_hash(board):
+    """Full recompute of a board's key; Board keeps it up to date incrementally."""
+    key = 0
+    for color in (RED, WHITE):
+        for piece in board.get_all_pieces(color):
+            key ^= piece_key(piece.color, piece.type, piece.row, piece.col)
+    return key
@@ -2,16 +2,28 @@ import pygame
 from pygame.locals import *
 from checkers.constants import WIDTH, HEIGHT, SQUARE_SIZE, RED, WHITE, BLUE
 from checkers.game import Game
-from minimax.algo import minimax
-from minimax.algorithm import alpha_beta_minimax
-from minimax.genetic_algorithm import genetic_algorithm, get_optimized_evaluation_function
-from minimax.ga_minimax import GA_minimax
-from PIL import Image
-import imageio
-import numpy as np
+from checkers.render import BoardRenderer
+from checkers.animation import get_animation
+from checkers.bitboard import BitBoard
+from minimax.transposition import TranspositionTable
+from minimax.iterative import iterative_deepening, ga_search, minimax_search, alpha_beta_search
+from minimax.algorithm import play_move
+from minimax.opening_book import open_book
+from minimax.tablebase import open_tablebase
+from checkers.async_ai import AsyncAI
+from checkers.record import GameRecord, RECORDS_PATH
+from minimax.stats import SearchStats
+import os
+from functools import lru_cache
+from minimax.genetic_algorithm import get_optimized_evaluation_function
+from minimax.param_cache import get_params
 
 # Constants
 FPS = 60
+# Menus only change on input: they tick at FPS just after some and drop to MENU_IDLE_FPS
+# once there has been none for MENU_IDLE_AFTER ms
+MENU_IDLE_FPS = 10
+MENU_IDLE_AFTER = 1000
 BACKGROUND_COLOR = (255, 240, 200)
 BACKGROUND_COLORR = (255, 255, 255)
 BUTTON_COLOR = (255, 150, 50)
@@ -22,9 +34,40 @@ SHADOW_COLOR = (100, 100, 100)
 pygame.init()
 WIN = pygame.display.set_mode((WIDTH, HEIGHT))
 pygame.display.set_caption("Checkers")
-BUTTON_FONT = pygame.font.SysFont("comicsans", 40)
-TITLE_FONT = pygame.font.SysFont("comicsans", 50)
+
+
+@lru_cache(maxsize=None)
+def get_font(size):
+    # SysFont scans the system fonts, so each size is created once
+    return pygame.font.SysFont("comicsans", size)
+
+
+@lru_cache(maxsize=256)
+def render_text(text, font, color):
+    return font.render(text, True, color)
+
+
+BUTTON_FONT = get_font(40)
+TITLE_FONT = get_font(50)
+THINKING_FONT = get_font(30)
+INSTRUCTIONS_FONT = get_font(25)
 BUTTON_WIDTH, BUTTON_HEIGHT = 200, 80
+# The top row of squares, which the thinking message is drawn over
+INDICATOR_RECT = pygame.Rect(0, 0, WIDTH, SQUARE_SIZE)
+
+# Per-move search budgets: the AI deepens until either limit is hit or max_depth is done
+AI_BUDGETS = {
+    'Easy': {'time_limit': 0.3, 'node_limit': 5000, 'max_depth': 4},
+    'Medium': {'time_limit': 0.5, 'node_limit': 20000, 'max_depth': 3},
+    'Hard': {'time_limit': 1.5, 'node_limit': 300000, 'max_depth': 12},
+}
+# Book moves come from a deep alpha-beta search, so the weaker levels keep searching for themselves
+BOOK_DIFFICULTIES = ('Hard',)
+
+# Set SEARCH_LOG to a file name to append every AI search's statistics to it as JSON lines
+SEARCH_LOG = os.environ.get('SEARCH_LOG')
+# Every game is appended here for python -m minimax.replay; set GAME_RECORDS to '' to keep none
+GAME_RECORDS = os.environ.get('GAME_RECORDS', RECORDS_PATH)
 
 background_image = pygame.transform.scale(pygame.image.load('background.jpg'), (WIDTH, HEIGHT))
 
@@ -39,11 +82,11 @@ def draw_text_center(text, font, color, surface, center, shadow=False):
     if shadow:
         shadow_color = (0, 0, 0)
         shadow_offset = (3, 3)
-        shadow_text = font.render(text, True, shadow_color)
+        shadow_text = render_text(text, font, shadow_color)
         shadow_rect = shadow_text.get_rect(center=(center[0] + shadow_offset[0], center[1] + shadow_offset[1]))
         surface.blit(shadow_text, shadow_rect)
     
-    textobj = font.render(text, True, color)
+    textobj = render_text(text, font, color)
     textrect = textobj.get_rect(center=center)
     surface.blit(textobj, textrect)
 
@@ -61,14 +104,14 @@ def draw_opening_screen():
     pygame.display.update()
     return start_button_rect
 
-def draw_difficulty_screen():
+def draw_difficulty_screen(hovered=None):
     WIN.fill(BACKGROUND_COLOR)
     draw_text_center('DIFFICULTY LEVEL', TITLE_FONT, TEXT_COLOR, WIN, (WIDTH // 2, HEIGHT // 6))
     buttons = []
     for i, text in enumerate(['Easy', 'Medium', 'Hard', 'Very Hard']):
         button_rect = pygame.Rect(WIDTH // 2 - BUTTON_WIDTH // 2, HEIGHT // 4 + i * (BUTTON_HEIGHT + 20), BUTTON_WIDTH, BUTTON_HEIGHT)
         buttons.append((button_rect, text))
-        draw_button(button_rect, text, False)
+        draw_button(button_rect, text, text == hovered)
         
 
     
@@ -78,27 +121,38 @@ def draw_difficulty_screen():
     
     draw_button(how_to_play_button_rect, 'How to Play', False)
     
-    for event in pygame.event.get():
-        if event.type == pygame.MOUSEMOTION:
-            draw_instructions_screen()  # Transition to instructions screen
-    
     pygame.display.update()
     return buttons, how_to_play_button_rect
 
 
+def hovered_button(buttons, pos):
+    for button_rect, text in buttons:
+        if button_rect.collidepoint(pos):
+            return text
+    return None
+
+
+def draw_hover_change(buttons, old, new):
+    # Only the buttons whose hover state changed are drawn and sent to the display
+    rects = []
+    for button_rect, text in buttons:
+        if text in (old, new):
+            draw_button(button_rect, text, text == new)
+            rects.append(button_rect.inflate(10, 10))
+    pygame.display.update(rects)
+
+
 
 
 def draw_instructions_screen():
     WIN.fill(BACKGROUND_COLOR)  # Fill with background color
     
     # Title
-    title_font = pygame.font.SysFont("comicsans", 50)
-    title_text = title_font.render("Instructions", True, TEXT_COLOR)
+    title_text = render_text("Instructions", TITLE_FONT, TEXT_COLOR)
     title_rect = title_text.get_rect(center=(WIDTH // 2, HEIGHT // 8))
     WIN.blit(title_text, title_rect)
     
     # Instructions text
-    instructions_font = pygame.font.SysFont("comicsans", 25)
     instructions_text = [
         "Rules:",
         "Soldier can move forward 1 cell","and capture opponent pieces."," It replaces the opponent's piece in that cell.",
@@ -111,7 +165,7 @@ def draw_instructions_screen():
     start_y = HEIGHT // 4 + 50  # Adjusted starting Y position for content
     
     for i, line in enumerate(instructions_text):
-        text_render = instructions_font.render(line, True, TEXT_COLOR)
+        text_render = render_text(line, INSTRUCTIONS_FONT, TEXT_COLOR)
         text_rect = text_render.get_rect(center=(WIDTH // 2, start_y + i * line_spacing))
         
         # Add extra space between every second line for better readability
@@ -123,7 +177,7 @@ def draw_instructions_screen():
     # Close button
     close_button_rect = pygame.Rect(WIDTH - 80, 30, 50, 50)
     pygame.draw.rect(WIN, BUTTON_COLOR, close_button_rect, border_radius=15)
-    close_text = instructions_font.render('X', True, (255, 255, 255))
+    close_text = render_text('X', INSTRUCTIONS_FONT, (255, 255, 255))
     text_rect = close_text.get_rect(center=close_button_rect.center)
     WIN.blit(close_text, text_rect)
     
@@ -136,18 +190,12 @@ def draw_instructions_screen():
 
 
 
-def load_gif(filename):
-    gif = imageio.get_reader(filename)
-    return [np.array(frame) for frame in gif]
+def thinking_message():
+    return 'AI is thinking' + '.' * (pygame.time.get_ticks() // 300 % 4)
+
 
-def resize_gif_frames(gif_frames, new_size=(WIDTH, HEIGHT)):
-    resized_frames = []
-    for frame in gif_frames:
-        pil_image = Image.fromarray(frame)
-        pil_image = pil_image.resize(new_size, resample=Image.BILINEAR)
-        pygame_image = pygame.image.fromstring(pil_image.tobytes(), pil_image.size, pil_image.mode)
-        resized_frames.append(pygame_image)
-    return resized_frames
+def draw_thinking_indicator(message):
+    draw_text_center(message, THINKING_FONT, BLUE, WIN, (WIDTH // 2, SQUARE_SIZE // 2), shadow=True)
 
 
 def draw_winner_screen(winner, gif_filename_win, gif_filename_lose):
@@ -164,8 +212,10 @@ def draw_winner_screen(winner, gif_filename_win, gif_filename_lose):
         gif_filename = None
 
     if gif_filename:
-        gif_frames = resize_gif_frames(load_gif(gif_filename), (WIDTH, HEIGHT))
-        frame_index, num_frames, clock, running = 0, len(gif_frames), pygame.time.Clock(), True
+        # Decoded once per run (and kept scaled in .cache), streamed in while the first frames play;
+        # only the frame on screen is kept converted
+        animation = get_animation(gif_filename, (WIDTH, HEIGHT))
+        frame_index, clock, running = 0, pygame.time.Clock(), True
 
         # Define play_again_button_rect before the loop
         play_again_button_rect = pygame.Rect(WIDTH // 2 - BUTTON_WIDTH // 2, HEIGHT - BUTTON_HEIGHT - 50, BUTTON_WIDTH, BUTTON_HEIGHT)
@@ -179,11 +229,15 @@ def draw_winner_screen(winner, gif_filename_win, gif_filename_lose):
                     if play_again_button_rect.collidepoint(pos):
                         return 'opening'
 
-            WIN.blit(gif_frames[frame_index], (0, HEIGHT // 50))
+            animation.update()
+            if animation.frames:
+                WIN.blit(animation.frame(frame_index), (0, HEIGHT // 50))
+                frame_index = animation.next_index(frame_index)
+            else:
+                WIN.fill(BACKGROUND_COLORR)
             draw_text_center(winner_text, TITLE_FONT, TEXT_COLOR, WIN, (WIDTH // 2, HEIGHT // 10), shadow=True)
             draw_button(play_again_button_rect, 'Play Again', False)
             pygame.display.flip()
-            frame_index = (frame_index + 1) % num_frames
             clock.tick(12)
         pygame.display.update()    
         
@@ -191,68 +245,127 @@ def draw_winner_screen(winner, gif_filename_win, gif_filename_lose):
 
 
 def main():
-    run, clock, screen_state, buttons, how_to_play_button_rect = True, pygame.time.Clock(), 'opening', [], None
+    # Each screen is drawn once when it is entered; after that only input changes anything
+    run, clock, screen_state, redraw, hovered = True, pygame.time.Clock(), 'opening', True, None
+    last_input = pygame.time.get_ticks()
+    button_rect = how_to_play_button_rect = close_button_rect = None
+    buttons = []
 
     while run:
-        clock.tick(FPS)
-        if screen_state == 'opening':
-            button_rect = draw_opening_screen()
-        elif screen_state == 'difficulty':
-            buttons, how_to_play_button_rect = draw_difficulty_screen()
-            screen_state = 'difficulty_screen'
-        elif screen_state == 'instructions':
-            close_button_rect = draw_instructions_screen()
-
-        for event in pygame.event.get():
+        clock.tick(FPS if pygame.time.get_ticks() - last_input < MENU_IDLE_AFTER else MENU_IDLE_FPS)
+        if redraw:
+            if screen_state == 'opening':
+                button_rect = draw_opening_screen()
+            elif screen_state == 'difficulty':
+                buttons, how_to_play_button_rect = draw_difficulty_screen(hovered)
+            elif screen_state == 'instructions':
+                close_button_rect = draw_instructions_screen()
+            redraw = False
+
+        events = pygame.event.get()
+        if events:
+            last_input = pygame.time.get_ticks()
+        for event in events:
             if event.type == QUIT:
-                
-                if screen_state == 'difficulty_screen':
-                    screen_state = 'opening'
+                if screen_state == 'difficulty':
+                    screen_state, redraw = 'opening', True
                 else:
                     run = False
-            
-                
-                 
+            elif redraw:
+                # The new screen is not drawn yet, so none of its buttons can be hovered or clicked
+                continue
+            elif event.type == MOUSEMOTION and screen_state == 'difficulty':
+                now_hovered = hovered_button(buttons, event.pos)
+                if now_hovered != hovered:
+                    draw_hover_change(buttons, hovered, now_hovered)
+                    hovered = now_hovered
             elif event.type == MOUSEBUTTONDOWN:
-                pos = pygame.mouse.get_pos()
+                pos = event.pos
                 if screen_state == 'opening' and button_rect.collidepoint(pos):
-                    
-                    screen_state = 'difficulty'
-                elif screen_state == 'difficulty_screen':
-                    for button_rect, text in buttons:
-                        if button_rect.collidepoint(pos):
-                            
-                            game_loop(text)
-                            screen_state = 'opening'
+                    screen_state, redraw, hovered = 'difficulty', True, None
+                elif screen_state == 'difficulty':
+                    difficulty = hovered_button(buttons, pos)
+                    if difficulty is not None:
+                        game_loop(difficulty)
+                        screen_state, redraw = 'opening', True
+                        # Anything queued before the game belongs to the menu it left
+                        break
                     if how_to_play_button_rect.collidepoint(pos):
-                        
-                        screen_state = 'instructions'
+                        screen_state, redraw = 'instructions', True
                 elif screen_state == 'instructions' and close_button_rect.collidepoint(pos):
-                    
-                    screen_state = 'difficulty'
-
-        if screen_state == 'difficulty_screen':
-            for button_rect, text in buttons:
-                draw_button(button_rect, text, button_rect.collidepoint(pygame.mouse.get_pos()))
-
-        pygame.display.update()
+                    screen_state, redraw, hovered = 'difficulty', True, None
 
     pygame.quit()
     return 'opening'
 
+def get_ai_think(difficulty, tt, evaluation_function, tablebase=None, searches=None):
+    # The AI's move for a difficulty as think(board, budget) -> new board, run by AsyncAI.
+    # Each move also appends (source, completed depth) to searches, for the game record.
+    searches = [] if searches is None else searches
+    if difficulty == 'Very Hard':
+        # Building the fuzzy control system is slow, so it is only imported when picked
+        from minimax.fuzzy import determine_best_fuzzy_move
+
+        def think(board, budget):
+            print("using fuzzy")
+            searches.append(('fuzzy', None))
+            return determine_best_fuzzy_move(board)
+        return think
+
+    search, name = {
+        'Easy': (ga_search(evaluation_function), "hybrid genetic and minimax algorithm"),
+        'Medium': (minimax_search, "minimax"),
+        'Hard': (alpha_beta_search, "alpha beta pruning"),
+    }[difficulty]
+    book = open_book() if difficulty in BOOK_DIFFICULTIES else None
+
+    def think(board, budget):
+        move = book.lookup(board) if book is not None else None
+        if move is not None:
+            print("using opening book")
+            searches.append(('book', None))
+            return play_move(board, move)
+        print(f"using {name}")
+        stats = SearchStats()
+        value, new_board, depth = iterative_deepening(board, search, tt=tt, budget=budget, max_depth=AI_BUDGETS[difficulty]['max_depth'], stats=stats, tablebase=tablebase)
+        print(f"searched to depth {depth}; {stats.summary()}; {tt.report()}")
+        if SEARCH_LOG:
+            stats.log(SEARCH_LOG, difficulty=difficulty, position=board.hash, completed_depth=depth, value=value)
+        searches.append(('search', depth))
+        return new_board
+    return think
+
+def save_record(record, game, result=None):
+    # A game left before any move is not worth keeping
+    if GAME_RECORDS and game.moves:
+        record.moves, record.result = game.moves, result or game.winner()
+        record.save(GAME_RECORDS)
+
 def game_loop(difficulty):
     run = True
     clock = pygame.time.Clock()
-    game = Game(WIN)
-
-    optimized_params = genetic_algorithm()  # Optimize evaluation function parameters
+    game = Game(BitBoard)
+    tt = TranspositionTable()
+    ai = AsyncAI()
+    record, searches = GameRecord(difficulty), []
+
+    # Tuned offline with python -m minimax.param_cache
+    optimized_params, cached = get_params()
+    print("using cached GA parameters" if cached else "no cached GA parameters, using defaults (run python -m minimax.param_cache)")
     optimized_evaluation_function = get_optimized_evaluation_function(optimized_params)
+    # Built offline with python -m minimax.tablebase; endgames are searched without it otherwise
+    tablebase = open_tablebase()
+    ai_think = get_ai_think(difficulty, tt, optimized_evaluation_function, tablebase, searches)
+    budget = AI_BUDGETS.get(difficulty, {})
+    renderer, shown_message = BoardRenderer(), None
 
     while run:
         clock.tick(FPS)
         
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
+                ai.cancel()
+                save_record(record, game)
                 run = False
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 if game.turn == RED:  # Player's turn
@@ -261,6 +374,7 @@ def game_loop(difficulty):
                     print(f"Mouse clicked at ({row}, {col})")
                     game.select(row, col)
                     if game.winner() is not None:
+                        save_record(record, game)
                         if game.winner() == "WHITE":
                             
                             draw_winner_screen("WHITE", "win.gif", "lose.gif")
@@ -271,28 +385,32 @@ def game_loop(difficulty):
                             
                         
                         pygame.time.delay(2000)
+                        ai.shutdown()
                         game.reset()  # Reset the game after displaying winner
                         return 'opening'  # Continue to next iteration of the loop
 
-        if game.turn == WHITE and game.winner() is None:
-            print("AI's Turn")
-            if difficulty == 'Easy':
-                print("using hybrid genetic and minimax algorithm")
-                value, new_board = GA_minimax(game.get_board(), 4, True, float('-inf'), float('inf'), game, optimized_evaluation_function)
-                game.ai_move(new_board)
-            elif difficulty == 'Medium':
-                print("using minimax")
-                value, new_board = minimax(game.get_board(), 2, True, game)
-                game.ai_move(new_board)
-            elif difficulty == 'Hard':
-                print("using alpha beta pruning")
-                value, new_board = alpha_beta_minimax(game.get_board(), 3, float('-inf'), float('inf'), True, game)
-                game.ai_move(new_board)
-            elif difficulty == 'Very Hard':
-                print("using fuzzy")
-                game.ai_fuzzy_move()
+        if game.turn == WHITE and game.winner() is None and run:
+            # The search runs in the background; check on it once per frame
+            if not ai.thinking:
+                print("AI's Turn")
+                # Seeded per ply, so minimax.replay can run this search again
+                ai.start(ai_think, game.get_board(), budget.get('time_limit'), budget.get('node_limit'), record.search_seed(len(game.moves)))
+            else:
+                done, new_board = ai.poll()
+                if done:
+                    source, depth = searches.pop() if searches else (None, None)
+                    if new_board is None:
+                        # WHITE has no move to play: a loss, as the searches score it
+                        ai.shutdown()
+                        save_record(record, game, "RED")
+                        draw_winner_screen("RED", "win.gif", "lose.gif")
+                        return 'opening'
+                    record.add_search(len(game.moves), source, depth)
+                    game.ai_move(new_board)
                 
         if game.winner():
+            ai.shutdown()
+            save_record(record, game)
             if game.winner() == "WHITE":
                             
                 draw_winner_screen("WHITE", "win.gif", "lose.gif")
@@ -306,10 +424,22 @@ def game_loop(difficulty):
             return 'opening'
             
         
-        game.update()  # Update the game state and display
-        game.draw_valid_moves(game.valid_moves)
-        pygame.display.update()  # Update the display
-
+        # Only the squares that changed are drawn and sent to the display
+        message = thinking_message() if ai.thinking else None
+        if message != shown_message:
+            renderer.invalidate(INDICATOR_RECT)
+        dirty = renderer.draw(WIN, game)
+        if message is not None and INDICATOR_RECT.collidelist(dirty) != -1:
+            if message == shown_message:
+                # The text is drawn over the squares, so all of them under it must be fresh
+                renderer.invalidate(INDICATOR_RECT)
+                dirty += renderer.draw(WIN, game)
+            draw_thinking_indicator(message)
+        shown_message = message
+        if dirty:
+            pygame.display.update(dirty)
+
+    ai.shutdown()
     main()
 
 if __name__ == "__main__":
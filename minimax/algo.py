@@ -1,11 +1,15 @@
 from copy import deepcopy
 #deepcopy will copy not only the reference but also the object itself
-import pygame
+from minimax.transposition import EXACT
 
 RED = (255,0,0)
 WHITE = (255, 255, 255)
 
-def minimax(position, depth, max_player, game):
+def minimax(position, depth, max_player, game, in_place=False):
+    if in_place:
+        value, move = minimax_in_place(position, depth, max_player)
+        return value, play_move(position, move)
+
     if depth == 0 or position.winner() != None:
         return position.evaluate(), position
     
@@ -31,6 +35,72 @@ def minimax(position, depth, max_player, game):
         return minEval, best_move
 
 
+def minimax_in_place(board, depth, max_player, tt=None, budget=None, stats=None, tablebase=None, ply=0):
+    # Same search on a single board, using make_move/unmake_move instead of copies
+    if budget is not None:
+        budget.tick()
+    if stats is not None:
+        stats.nodes += 1
+    if tablebase is not None and ply > 0:
+        # Exact scores for the positions the tablebase covers and for finished games
+        score = tablebase.score(board, max_player)
+        if score is not None:
+            if stats is not None:
+                stats.leaves += 1
+            return score, None
+    if depth == 0 or board.winner() != None:
+        if stats is not None:
+            stats.leaves += 1
+        return board.evaluate(), None
+
+    # The table only orders moves here: best move from the previous visit first
+    moves = board.get_move_list(WHITE if max_player else RED)
+    if tt is not None:
+        key = tt.key(board, max_player)
+        entry = tt.probe(key)
+        if entry is not None and entry[3] in moves:
+            moves.remove(entry[3])
+            moves.insert(0, entry[3])
+    if stats is not None and moves:
+        # Nothing is pruned, so every move is searched
+        stats.expanded += 1
+        stats.children += len(moves)
+
+    if max_player:
+        maxEval = float('-inf')
+        best_move = None
+        for move in moves:
+            undo = board.make_move(move)
+            evaluation = minimax_in_place(board, depth-1, False, tt, budget, stats, tablebase, ply+1)[0]
+            board.unmake_move(undo)
+            maxEval = max(maxEval, evaluation)
+            if maxEval == evaluation:
+                best_move = move
+    else:
+        minEval = float('inf')
+        best_move = None
+        for move in moves:
+            undo = board.make_move(move)
+            evaluation = minimax_in_place(board, depth-1, True, tt, budget, stats, tablebase, ply+1)[0]
+            board.unmake_move(undo)
+            minEval = min(minEval, evaluation)
+            if minEval == evaluation:
+                best_move = move
+
+    if tt is not None and best_move is not None:
+        tt.store(key, depth, maxEval if max_player else minEval, EXACT, best_move)
+    return (maxEval if max_player else minEval), best_move
+
+
+def play_move(board, move):
+    # Board after move, leaving the searched board untouched
+    if move is None:
+        return None
+    new_board = deepcopy(board)
+    new_board.make_move(move)
+    return new_board
+
+
 def simulate_move(piece, move, board, game, skip):
 
     if piece:
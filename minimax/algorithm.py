@@ -1,11 +1,26 @@
 from copy import deepcopy
+from minimax.transposition import EXACT, LOWER, UPPER
+from checkers.evaluation import PIECE_VALUES
 RED = (255, 0, 0)
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
 BLUE = (0, 0, 255)
 GREY = (128, 128, 128)
 
-def alpha_beta_minimax(position, depth, alpha, beta, max_player, game):
+# Quiescence: positions searched past the horizon per horizon position, before the
+# exchange is scored as it stands; and the most a capture can gain on top of the
+# captured piece (a soldier capturing onto the last row becomes a king)
+QUIESCENCE_NODES = 64
+DELTA_MARGIN = PIECE_VALUES['king'] - PIECE_VALUES['soldier']
+
+def alpha_beta_minimax(position, depth, alpha, beta, max_player, game, in_place=False, tt=None, batch=False, quiescence=False):
+    # The transposition table, batch leaf evaluation and quiescence are only used by the in-place search
+    if in_place:
+        if tt is not None:
+            tt.new_search()
+        value, move = alpha_beta_in_place(position, depth, alpha, beta, max_player, tt, batch=batch, quiescence=quiescence)
+        return value, play_move(position, move)
+
     if depth == 0 or position.winner() is not None:
         return position.evaluate(), position
     
@@ -34,6 +49,197 @@ def alpha_beta_minimax(position, depth, alpha, beta, max_player, game):
                 break
         return min_eval, best_move
 
+def alpha_beta_in_place(board, depth, alpha, beta, max_player, tt=None, budget=None, orderer=None, ply=0, batch=False, stats=None, tablebase=None, quiescence=False):
+    # Same search on a single board, using make_move/unmake_move instead of copies.
+    # With quiescence, depth 0 plays out the captures in progress instead of stopping mid-exchange.
+    if budget is not None:
+        budget.tick()
+    if stats is not None:
+        stats.nodes += 1
+    if tablebase is not None and ply > 0:
+        # Exact scores for the positions the tablebase covers and for finished games
+        score = tablebase.score(board, max_player)
+        if score is not None:
+            if stats is not None:
+                stats.leaves += 1
+            return score, None
+    if quiescence and depth == 0 and board.winner() is None:
+        return quiescence_search(board, alpha, beta, max_player, budget, stats, tablebase, [QUIESCENCE_NODES]), None
+    if depth == 0 or board.winner() is not None:
+        if stats is not None:
+            stats.leaves += 1
+        return board.evaluate(), None
+
+    tt_move = None
+    if tt is not None:
+        key = tt.key(board, max_player)
+        entry = tt.probe(key)
+        if entry is not None:
+            entry_depth, score, flag, tt_move = entry
+            if entry_depth >= depth and (flag == EXACT or (flag == LOWER and score >= beta)
+                                         or (flag == UPPER and score <= alpha)):
+                tt.cutoffs += 1
+                return score, tt_move
+        alpha_orig, beta_orig = alpha, beta
+
+    moves = board.get_move_list(WHITE if max_player else RED)
+    if orderer is not None:
+        moves = orderer.order(board, moves, ply)
+    if tt_move in moves:
+        # Try the best move from the previous visit first
+        moves.remove(tt_move)
+        moves.insert(0, tt_move)
+    # At the frontier every child is a leaf, so score them all in one numpy pass
+    # (numpy is only imported once a batched search asks for it)
+    leaf_scores = None
+    if batch and not quiescence and depth == 1 and moves and (tablebase is None or not tablebase.reaches(board)):
+        from minimax.batch_eval import child_scores
+        leaf_scores = child_scores(board, moves)
+    if stats is not None and moves:
+        stats.expanded += 1
+
+    if max_player:
+        max_eval = float('-inf')
+        best_move = None
+        for index, move in enumerate(moves):
+            if stats is not None:
+                stats.children += 1
+            if leaf_scores is not None:
+                if budget is not None:
+                    budget.tick()
+                if stats is not None:
+                    stats.nodes += 1
+                    stats.leaves += 1
+                evaluation = leaf_scores[index]
+            else:
+                undo = board.make_move(move)
+                evaluation, _ = alpha_beta_in_place(board, depth-1, alpha, beta, False, tt, budget, orderer, ply+1, batch, stats, tablebase, quiescence)
+                board.unmake_move(undo)
+            max_eval = max(max_eval, evaluation)
+            if max_eval == evaluation:
+                best_move = move
+            alpha = max(alpha, max_eval)
+            if beta <= alpha:
+                if orderer is not None:
+                    orderer.record_cutoff(board, move, ply, depth)
+                if stats is not None:
+                    stats.cutoffs[ply] += 1
+                break
+        value = max_eval
+    else:
+        min_eval = float('inf')
+        best_move = None
+        for index, move in enumerate(moves):
+            if stats is not None:
+                stats.children += 1
+            if leaf_scores is not None:
+                if budget is not None:
+                    budget.tick()
+                if stats is not None:
+                    stats.nodes += 1
+                    stats.leaves += 1
+                evaluation = leaf_scores[index]
+            else:
+                undo = board.make_move(move)
+                evaluation, _ = alpha_beta_in_place(board, depth-1, alpha, beta, True, tt, budget, orderer, ply+1, batch, stats, tablebase, quiescence)
+                board.unmake_move(undo)
+            min_eval = min(min_eval, evaluation)
+            if min_eval == evaluation:
+                best_move = move
+            beta = min(beta, min_eval)
+            if beta <= alpha:
+                if orderer is not None:
+                    orderer.record_cutoff(board, move, ply, depth)
+                if stats is not None:
+                    stats.cutoffs[ply] += 1
+                break
+        value = min_eval
+
+    if tt is not None and best_move is not None:
+        if value <= alpha_orig:
+            flag = UPPER
+        elif value >= beta_orig:
+            flag = LOWER
+        else:
+            flag = EXACT
+        tt.store(key, depth, value, flag, best_move)
+    return value, best_move
+
+def quiescence_search(board, alpha, beta, max_player, budget=None, stats=None, tablebase=None, nodes=None):
+    """Score of board once the side to move's captures have been played out.
+
+    The side to move may stand pat on the static score or capture; only
+    captures are searched, most valuable victim first, and a capture that
+    could not lift the score to alpha even with DELTA_MARGIN on top is not
+    tried. nodes is a one-item list of positions left to search, shared by
+    the whole quiescence tree; when it runs out every position is scored
+    as it stands.
+    """
+    if nodes is None:
+        nodes = [QUIESCENCE_NODES]
+    nodes[0] -= 1
+    if budget is not None:
+        budget.tick()
+    if stats is not None:
+        stats.nodes += 1
+        stats.quiescence_nodes += 1
+    if tablebase is not None:
+        score = tablebase.score(board, max_player)
+        if score is not None:
+            if stats is not None:
+                stats.leaves += 1
+            return score
+    stand_pat = board.evaluate()
+    if board.winner() is not None or nodes[0] <= 0:
+        if stats is not None:
+            stats.leaves += 1
+        return stand_pat
+
+    if max_player:
+        if stand_pat >= beta:
+            return stand_pat
+        alpha = max(alpha, stand_pat)
+    else:
+        if stand_pat <= alpha:
+            return stand_pat
+        beta = min(beta, stand_pat)
+    captures = [move for move in board.get_move_list(WHITE if max_player else RED) if move[2] is not None]
+    captures.sort(key=lambda move: PIECE_VALUES[move[2]], reverse=True)
+    if stats is not None:
+        if captures:
+            stats.expanded += 1
+        else:
+            stats.leaves += 1
+
+    best = stand_pat
+    for move in captures:
+        gain = PIECE_VALUES[move[2]] + DELTA_MARGIN
+        # Captures are sorted by victim, so none of the rest can reach the window either
+        if (stand_pat + gain <= alpha) if max_player else (stand_pat - gain >= beta):
+            break
+        if stats is not None:
+            stats.children += 1
+        undo = board.make_move(move)
+        score = quiescence_search(board, alpha, beta, not max_player, budget, stats, tablebase, nodes)
+        board.unmake_move(undo)
+        if max_player:
+            best = max(best, score)
+            alpha = max(alpha, best)
+        else:
+            best = min(best, score)
+            beta = min(beta, best)
+        if beta <= alpha:
+            break
+    return best
+
+def play_move(board, move):
+    # Board after move, leaving the searched board untouched
+    if move is None:
+        return None
+    new_board = deepcopy(board)
+    new_board.make_move(move)
+    return new_board
+
 def simulate_move(piece, move, board, game, skip):
     # Ensure piece is a valid piece object
     if piece:
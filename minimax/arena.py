@@ -0,0 +1,290 @@
+import json
+import math
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from checkers.bitboard import BitBoard
+from checkers.record import find_move
+from checkers.constants import ROWS, COLS, RED, WHITE
+from minimax.algorithm import play_move
+from minimax.iterative import SearchBudget, iterative_deepening, alpha_beta_search, alpha_beta_quiescence_search, minimax_search, ga_search
+from minimax.transposition import TranspositionTable
+
+# Engine against engine, headless: games from random openings, spread over a
+# process pool, each one appended to a JSON lines file as soon as it ends.
+#
+# Every engine is a factory for think(board, budget) -> board after WHITE's
+# move (or None), the contract main.py's AI levels use. An engine playing RED
+# is handed the board mirrored top to bottom with the colors swapped, which
+# the rules are symmetric under, so every engine only ever plays WHITE.
+
+MAX_PLIES = 200  # a game still running after this many plies is a draw
+OPENING_PLIES = 4
+TIME_LIMIT = 0.2  # seconds per move
+
+
+def random_engine():
+    def think(board, budget):
+        moves = board.get_move_list(WHITE)
+        return play_move(board, random.choice(moves)) if moves else None
+    return think
+
+
+def search_engine(make_search, max_depth, use_tablebase=False):
+    # Iterative deepening as in main.py, with a table of its own for each game
+    def factory():
+        search, tt = make_search(), TranspositionTable()
+        tablebase = None
+        if use_tablebase:
+            from minimax.tablebase import open_tablebase
+            tablebase = open_tablebase()
+            if tablebase is None:
+                raise RuntimeError("no tablebase; build one with python -m minimax.tablebase")
+
+        def think(board, budget):
+            return iterative_deepening(board, search, tt=tt, budget=budget, max_depth=max_depth, tablebase=tablebase)[1]
+        return think
+    return factory
+
+
+def ga_minimax_search():
+    # The tuned parameters main.py would use, or the defaults
+    from minimax.genetic_algorithm import get_optimized_evaluation_function
+    from minimax.param_cache import get_params
+    return ga_search(get_optimized_evaluation_function(get_params()[0]))
+
+
+def fuzzy_engine():
+    from minimax.fuzzy import determine_best_fuzzy_move
+
+    def think(board, budget):
+        return determine_best_fuzzy_move(board)
+    return think
+
+
+# Depths as in main.AI_BUDGETS; add an entry here to bring a new engine into the arena
+ENGINES = {
+    'random': random_engine,
+    'minimax': search_engine(lambda: minimax_search, 3),
+    'alpha_beta': search_engine(lambda: alpha_beta_search, 12),
+    'alpha_beta_tablebase': search_engine(lambda: alpha_beta_search, 12, use_tablebase=True),
+    'alpha_beta_quiescence': search_engine(lambda: alpha_beta_quiescence_search, 12),
+    'GA_minimax': search_engine(ga_minimax_search, 4),
+    'fuzzy': fuzzy_engine,
+}
+
+
+def mirror_square(square):
+    row, col = divmod(square, COLS)
+    return (ROWS - 1 - row) * COLS + col
+
+
+def mirrored(board):
+    # The same position with RED and WHITE swapped and the rows reversed
+    pieces = [(ROWS - 1 - piece.row, piece.col, piece.type, WHITE if piece.color == RED else RED)
+              for piece in board.get_all_pieces(WHITE) + board.get_all_pieces(RED)]
+    new_board = BitBoard()
+    new_board.load_position(pieces)
+    return new_board
+
+
+def engine_move(think, board, color, time_limit, node_limit):
+    """(move, seconds) for the engine think playing color on board."""
+    position = board if color == WHITE else mirrored(board)
+    start = time.perf_counter()
+    new_board = think(position, SearchBudget(time_limit, node_limit))
+    seconds = time.perf_counter() - start
+    if new_board is None:
+        return None, seconds
+    move = find_move(position, WHITE, new_board)
+    if color == RED:
+        move = (mirror_square(move[0]), mirror_square(move[1]), move[2])
+    return move, seconds
+
+
+def play_game(first, second, opening, first_color, time_limit=TIME_LIMIT, node_limit=None,
+              max_plies=MAX_PLIES, opening_plies=OPENING_PLIES):
+    """One game between engines first and second as a record for the results file.
+
+    RED moves first, as in the game. The opening's random moves depend on
+    opening alone, so the same opening is played once with each engine on
+    each side. result is first's score: 1, 0.5 or 0.
+    """
+    random.seed(f'{opening}/{first_color}')
+    opening_random = random.Random(opening)
+    colors = {first_color: first, ('WHITE' if first_color == 'RED' else 'RED'): second}
+    thinkers = {RED: ENGINES[colors['RED']](), WHITE: ENGINES[colors['WHITE']]()}
+    think_time = {RED: [0.0, 0], WHITE: [0.0, 0]}
+    board, color, winner, reason = BitBoard(), RED, None, 'move cap'
+    for ply in range(max_plies):
+        other = WHITE if color == RED else RED
+        if ply < opening_plies:
+            moves = board.get_move_list(color)
+            move = opening_random.choice(moves) if moves else None
+        else:
+            move, seconds = engine_move(thinkers[color], board, color, time_limit, node_limit)
+            think_time[color][0] += seconds
+            think_time[color][1] += 1
+        if move is None:
+            # No move left loses, as in the searches
+            winner, reason = other, 'no moves'
+            break
+        board.make_move(move)
+        if board.winner() is not None:
+            winner, reason = board.winner(), 'captured all'
+            break
+        color = other
+    plies = ply + 1 if max_plies else 0
+
+    first_side = RED if first_color == 'RED' else WHITE
+    result = 0.5 if winner is None else 1.0 if winner == first_side else 0.0
+    return {
+        'engines': [first, second], 'opening': opening, 'first_color': first_color,
+        'result': result, 'reason': reason, 'plies': plies,
+        'think': {colors['RED']: think_time[RED], colors['WHITE']: think_time[WHITE]} if first != second
+        else {first: [think_time[RED][0] + think_time[WHITE][0], think_time[RED][1] + think_time[WHITE][1]]},
+        'settings': {'time_limit': time_limit, 'node_limit': node_limit, 'max_plies': max_plies, 'opening_plies': opening_plies},
+    }
+
+
+def read_results(path):
+    """Every record in a results file; a line cut off by an interrupted run is skipped."""
+    records = []
+    try:
+        with open(path) as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    pass
+    except OSError:
+        pass
+    return records
+
+
+def run_match(first, second, games, path, workers=None, seed=0, progress=None, **settings):
+    """Play games games between first and second and append each to path as it ends.
+
+    Games go in pairs over the same opening with the colors swapped. Games
+    already in path with the same engines and settings are not played again,
+    so an interrupted match picks up where it stopped. Returns the records of
+    this match, old and new.
+    """
+    for name in (first, second):
+        if name not in ENGINES:
+            raise ValueError(f"unknown engine {name!r}; choose from {', '.join(ENGINES)}")
+    settings = dict({'time_limit': TIME_LIMIT, 'node_limit': None, 'max_plies': MAX_PLIES, 'opening_plies': OPENING_PLIES}, **settings)
+    records = [record for record in read_results(path)
+               if record['engines'] == [first, second] and record['settings'] == settings]
+    done = {(record['opening'], record['first_color']) for record in records}
+    jobs = [(seed + index // 2, 'RED' if index % 2 == 0 else 'WHITE') for index in range(games)]
+    jobs = [job for job in jobs if job not in done]
+
+    workers = os.cpu_count() if workers is None else workers
+    with open(path, 'a') as f:
+        def finished(record):
+            f.write(json.dumps(record) + '\n')
+            f.flush()
+            records.append(record)
+            if progress:
+                progress(records)
+
+        if workers:
+            # Spawned workers import only the rules core and the engines, never pygame
+            with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+                futures = [executor.submit(play_game, first, second, opening, color, **settings) for opening, color in jobs]
+                try:
+                    for future in as_completed(futures):
+                        finished(future.result())
+                except KeyboardInterrupt:
+                    executor.shutdown(cancel_futures=True)
+                    raise
+        else:
+            for opening, color in jobs:
+                finished(play_game(first, second, opening, color, **settings))
+    return records
+
+
+def elo(score):
+    # Rating difference for an expected score; 0 and 1 would be infinite
+    score = min(max(score, 1e-6), 1 - 1e-6)
+    return -400 * math.log10(1 / score - 1) + 0.0
+
+
+def summarize(records):
+    """Win/draw/loss, Elo difference with a 95% interval, and think time per engine, from first's side."""
+    first, second = records[0]['engines']
+    wins = sum(record['result'] == 1.0 for record in records)
+    draws = sum(record['result'] == 0.5 for record in records)
+    losses = len(records) - wins - draws
+    score = (wins + draws / 2) / len(records)
+    # Per-game deviation of the score, for the error bar
+    variance = sum((record['result'] - score) ** 2 for record in records) / len(records)
+    margin = 1.96 * math.sqrt(variance / len(records))
+    think = {}
+    for record in records:
+        for name, (seconds, moves) in record['think'].items():
+            total = think.setdefault(name, [0.0, 0])
+            total[0] += seconds
+            total[1] += moves
+    return {
+        'engines': [first, second], 'games': len(records), 'wins': wins, 'draws': draws, 'losses': losses,
+        'score': score, 'elo': elo(score), 'elo_low': elo(score - margin), 'elo_high': elo(score + margin),
+        'plies': sum(record['plies'] for record in records) / len(records),
+        'think_ms': {name: seconds / moves * 1000 if moves else 0.0 for name, (seconds, moves) in think.items()},
+    }
+
+
+def report(summary):
+    first, second = summary['engines']
+    plus, minus = summary['elo_high'] - summary['elo'], summary['elo'] - summary['elo_low']
+    lines = [
+        f"{first} vs {second}: {summary['games']} games, +{summary['wins']} ={summary['draws']} -{summary['losses']}, "
+        f"score {summary['score']:.3f}, {summary['plies']:.0f} plies per game",
+    ]
+    if summary['score'] in (0.0, 1.0):
+        lines.append(f"Elo {first} - {second}: unbounded, one side scored every point")
+    else:
+        lines.append(f"Elo {first} - {second}: {summary['elo']:+.0f} (+{plus:.0f}/-{minus:.0f}, 95%)")
+    for name, ms in summary['think_ms'].items():
+        lines.append(f"  {name}: {ms:.1f} ms per move")
+    return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+    # python -m minimax.arena alpha_beta minimax --games 1000 [--workers N] [--time-limit S] ...
+    # python -m minimax.arena alpha_beta minimax --report-only   (summarize the results file so far)
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Play two engines against each other.')
+    parser.add_argument('first', choices=list(ENGINES))
+    parser.add_argument('second', choices=list(ENGINES))
+    parser.add_argument('--games', type=int, default=100, help='games in the match, in pairs with colors swapped')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (0 plays in this process); all cores by default')
+    parser.add_argument('--time-limit', type=float, default=TIME_LIMIT, help='seconds per move')
+    parser.add_argument('--node-limit', type=int, default=None, help='search nodes per move')
+    parser.add_argument('--max-plies', type=int, default=MAX_PLIES, help='plies before a game is called a draw')
+    parser.add_argument('--opening-plies', type=int, default=OPENING_PLIES, help='random plies at the start of every game')
+    parser.add_argument('--seed', type=int, default=0, help='number of the first opening')
+    parser.add_argument('--output', default='arena_results.jsonl', help='results file, appended to game by game')
+    parser.add_argument('--report-only', action='store_true', help='only summarize the games already in the results file')
+    args = parser.parse_args()
+
+    settings = {'time_limit': args.time_limit, 'node_limit': args.node_limit,
+                'max_plies': args.max_plies, 'opening_plies': args.opening_plies}
+    if args.report_only:
+        records = [record for record in read_results(args.output)
+                   if record['engines'] == [args.first, args.second] and record['settings'] == settings]
+    else:
+        def progress(records):
+            if len(records) % 20 == 0:
+                print(report(summarize(records)).splitlines()[0])
+        start = time.perf_counter()
+        records = run_match(args.first, args.second, args.games, args.output, args.workers, args.seed, progress, **settings)
+        print(f"finished in {time.perf_counter() - start:.1f}s")
+    if records:
+        print(report(summarize(records)))
+    else:
+        print("no games yet")
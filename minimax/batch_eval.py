@@ -0,0 +1,94 @@
+from functools import lru_cache
+import numpy as np
+from checkers.constants import ROWS, COLS, RED, WHITE
+from checkers.evaluation import PIECE_VALUES
+
+# One int8 code per square: 0 empty, 1-3 WHITE, 4-6 RED soldier/queen/king
+PIECE_TYPES = ('soldier', 'queen', 'king')
+CODES = {(color, type): offset + index + 1
+         for offset, color in ((0, WHITE), (3, RED)) for index, type in enumerate(PIECE_TYPES)}
+KING_CODES = {WHITE: CODES[(WHITE, 'king')], RED: CODES[(RED, 'king')]}
+
+MATERIAL = np.zeros(7, dtype=np.int64)
+for (color, type), code in CODES.items():
+    MATERIAL[code] = PIECE_VALUES[type] if color == WHITE else -PIECE_VALUES[type]
+
+SQUARES = np.arange(ROWS * COLS)
+# Squares a piece can be protected from: rows and columns 0-7, as in evaluation.is_protected
+PROTECTING = np.zeros((ROWS, COLS), dtype=bool)
+PROTECTING[:8, :8] = True
+
+
+def encode(board):
+    codes = np.zeros(ROWS * COLS, dtype=np.int8)
+    for color in (WHITE, RED):
+        for piece in board.get_all_pieces(color):
+            codes[piece.row * COLS + piece.col] = CODES[(piece.color, piece.type)]
+    return codes
+
+
+def pack(boards):
+    """Stack N boards into an (N, 81) array of piece codes."""
+    return np.stack([encode(board) for board in boards])
+
+
+def pack_children(board, moves):
+    """Codes of every position one move from board, without playing the moves."""
+    parent = encode(board)
+    codes = np.repeat(parent[np.newaxis, :], len(moves), axis=0)
+    rows = np.arange(len(moves))
+    origins = np.array([move[0] for move in moves])
+    targets = np.array([move[1] for move in moves])
+    moved = parent[origins]
+    # Reaching the first or last row promotes to king, as in Board.move
+    promoted = (targets < COLS) | (targets >= (ROWS - 1) * COLS)
+    moved = np.where(promoted & (moved <= 3), KING_CODES[WHITE], moved)
+    moved = np.where(promoted & (moved >= 4), KING_CODES[RED], moved)
+    codes[rows, origins] = 0
+    codes[rows, targets] = moved
+    return codes
+
+
+def material_scores(codes):
+    """Board.evaluate for every row of codes."""
+    return MATERIAL[codes].sum(axis=1)
+
+
+@lru_cache(maxsize=16)
+def weight_array(weights):
+    # (7, 81) piece-square array from EvalWeights tables, row 0 for empty squares
+    array = np.zeros((7, ROWS * COLS))
+    for key, code in CODES.items():
+        array[code] = weights.tables[key]
+    return array
+
+
+def protected_counts(codes):
+    """Protected WHITE pieces minus protected RED pieces for every row of codes."""
+    grid = codes.reshape(-1, ROWS, COLS)
+    counts = np.zeros(len(codes), dtype=np.int64)
+    for sign, lo, hi in ((1, 1, 3), (-1, 4, 6)):
+        own = (grid >= lo) & (grid <= hi)
+        padded = np.pad(own & PROTECTING, ((0, 0), (1, 1), (1, 1)))
+        neighbour = (padded[:, :-2, :-2] | padded[:, :-2, 2:] | padded[:, 2:, :-2] | padded[:, 2:, 2:])
+        counts += sign * (own & neighbour).sum(axis=(1, 2))
+    return counts
+
+
+def weighted_scores(codes, weights):
+    """The optimized GA evaluation (board.positional) for every row of codes."""
+    scores = weight_array(weights)[codes, SQUARES].sum(axis=1)
+    if weights.protection_bonus:
+        scores += protected_counts(codes) * weights.protection_bonus
+    return scores
+
+
+def child_scores(board, moves, weights=None):
+    """Scores of the positions after each move, as a list of Python numbers.
+
+    weights=None gives Board.evaluate, otherwise the running score for those EvalWeights.
+    """
+    codes = pack_children(board, moves)
+    if weights is None:
+        return material_scores(codes).tolist()
+    return weighted_scores(codes, weights).tolist()
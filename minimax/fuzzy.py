@@ -1,3 +1,4 @@
+from functools import lru_cache
 import numpy as np
 import skfuzzy as fuzz
 from skfuzzy import control as ctrl
@@ -71,45 +72,68 @@ rules = [
 move_ctrl = ctrl.ControlSystem(rules)
 move_simulation = ctrl.ControlSystemSimulation(move_ctrl)
 
+# Inputs used for each piece type
+PIECE_INPUTS = {'soldier': 2, 'queen': 5, 'king': 8}
+
+
+def skfuzzy_strength(piece_value, game_phase):
+    """move_strength straight from the skfuzzy control system, 0 where no rule fires."""
+    move_simulation.input['piece_value'] = piece_value
+    move_simulation.input['game_phase'] = game_phase
+    try:
+        move_simulation.compute()
+        return move_simulation.output['move_strength']
+    except (ValueError, KeyError):
+        return 0
+
+
+@lru_cache(maxsize=None)
+def cached_strength(piece_value, game_phase):
+    # A game only ever asks for 1 or a PIECE_INPUTS value at one of 27 piece counts,
+    # so each of those is run through skfuzzy once, the first time it comes up
+    return skfuzzy_strength(piece_value, game_phase)
+
+
+def lookup_strengths(piece_values, game_phase):
+    """move_strength for each of piece_values at one game phase."""
+    return [cached_strength(value, game_phase) for value in piece_values]
+
+
+# Prints the seconds the first fuzzy move takes, for timing it in a fresh process
+COLD_FIRST_MOVE = """
+import time
+from checkers.bitboard import BitBoard
+from minimax.fuzzy import determine_best_fuzzy_move
+start = time.perf_counter()
+determine_best_fuzzy_move(BitBoard())
+print(time.perf_counter() - start)
+"""
+
+
+def get_game_phase(board):
+    total_pieces = len(board.get_all_pieces(WHITE)) + len(board.get_all_pieces(RED))
+    return (total_pieces / (ROWS * COLS)) * 10
+
+
+def piece_move_strengths(board, piece, move_strength):
+    # Randomize the strength of each of the piece's moves, favouring captures
+    move_strengths = {}
+    for move, skips in board.get_valid_moves(piece).items():
+        if skips:  # Check if the move involves a capture
+            move_strengths[move] = move_strength + random.uniform(20, 30)  # Adjust strength for capturing moves
+        else:
+            move_strengths[move] = move_strength + random.uniform(-10, 10)  # Randomize non-capture move strength
+    return move_strengths
+
+
 # Function to calculate fuzzy move strength
 def calculate_fuzzy_move(board, row, col):
     piece = board.get_piece(row, col)
     if piece and piece.color == WHITE:  # Assuming AI controls WHITE pieces
-        if piece.type == 'soldier':
-            piece_value_value = 2
-        elif piece.type == 'queen':
-            piece_value_value = 5
-        elif piece.type == 'king':
-            piece_value_value = 8
-        else:
-            piece_value_value = 1
-        
-        total_pieces = sum(1 for r in range(ROWS) for c in range(COLS) if board.get_piece(r, c))
-        game_phase_value = (total_pieces / (ROWS * COLS)) * 10
-        
-        move_simulation.input['piece_value'] = piece_value_value
-        move_simulation.input['game_phase'] = game_phase_value
-        
-        try:
-            move_simulation.compute()
-            move_strength = move_simulation.output['move_strength']
-        except ValueError as e:
-            print(f"Error in fuzzy computation: {e}")
-            move_strength = 0
-        
-        # Get all possible moves for the piece
-        moves = board.get_valid_moves(piece)
-        
-        # Evaluate move strengths
-        move_strengths = {}
-        for move, skips in moves.items():
-            if skips:  # Check if the move involves a capture
-                move_strengths[move] = move_strength + random.uniform(20, 30)  # Adjust strength for capturing moves
-            else:
-                move_strengths[move] = move_strength + random.uniform(-10, 10)  # Randomize non-capture move strength
-        
-        return move_strengths
-    
+        piece_value_value = PIECE_INPUTS.get(piece.type, 1)
+        move_strength = lookup_strengths([piece_value_value], get_game_phase(board))[0]
+        return piece_move_strengths(board, piece, move_strength)
+
     return {}
 
 def simulate_move(piece, move, board, skip):
@@ -125,17 +149,17 @@ def determine_best_fuzzy_move(board):
     best_moves = []
     best_strength = -1
 
-    for row in range(ROWS):
-        for col in range(COLS):
-            piece = board.get_piece(row, col)
-            if piece and piece.color == WHITE:  # Assuming AI controls WHITE pieces
-                move_strengths = calculate_fuzzy_move(board, row, col)
-                for move, strength in move_strengths.items():
-                    if strength > best_strength:
-                        best_strength = strength
-                        best_moves = [(row, col, move, move_strengths)]
-                    elif strength == best_strength:
-                        best_moves.append((row, col, move, move_strengths))
+    # One surface lookup for every WHITE piece, in the row by row order of the original scan
+    pieces = sorted(board.get_all_pieces(WHITE), key=lambda piece: (piece.row, piece.col))
+    strengths = lookup_strengths([PIECE_INPUTS.get(piece.type, 1) for piece in pieces], get_game_phase(board))
+    for piece, move_strength in zip(pieces, strengths):
+        move_strengths = piece_move_strengths(board, piece, move_strength)
+        for move, strength in move_strengths.items():
+            if strength > best_strength:
+                best_strength = strength
+                best_moves = [(piece.row, piece.col, move, move_strengths)]
+            elif strength == best_strength:
+                best_moves.append((piece.row, piece.col, move, move_strengths))
 
     if best_moves:
         best_move = random.choice(best_moves)
@@ -161,3 +185,16 @@ if __name__ == '__main__':
     # Apply alpha-beta pruning for deeper move analysis
     alpha_beta_result, best_move = alpha_beta_minimax(board, 3, float('-inf'), float('inf'), True, game)
     print(f"Alpha-beta pruning result: {alpha_beta_result}, Best move: {best_move}")
+
+    # A fresh process, so neither the cache nor skfuzzy's own has seen any input yet
+    import os
+    import subprocess
+    import sys
+    import time
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    cold = subprocess.run([sys.executable, '-c', COLD_FIRST_MOVE], cwd=root, capture_output=True, text=True, check=True).stdout
+    print(f"first move in a fresh process: {float(cold) * 1000:.0f} ms")
+    start = time.perf_counter()
+    for _ in range(100):
+        determine_best_fuzzy_move(board)
+    print(f"determine_best_fuzzy_move: {(time.perf_counter() - start) * 10:.2f} ms")
@@ -8,8 +8,15 @@ GREY = (128, 128, 128)
 import random
 from copy import deepcopy
 from checkers.constants import RED, WHITE
+from minimax.transposition import EXACT
+
+def GA_minimax(position, depth, alpha, beta, max_player, game, evaluation_function, in_place=False, batch=False):
+    if in_place:
+        # Lets the board start its running score before any make/unmake
+        evaluation_function(position)
+        value, move = GA_minimax_in_place(position, depth, alpha, beta, max_player, evaluation_function, batch=batch)
+        return value, play_move(position, move)
 
-def GA_minimax(position, depth, alpha, beta, max_player, game, evaluation_function):
     if depth == 0 or position.winner() is not None:
         return evaluation_function(position) + random.uniform(-0.5, 0.5), position  # Add small randomness to evaluation
     
@@ -26,7 +33,7 @@ def GA_minimax(position, depth, alpha, beta, max_player, game, evaluation_functi
             alpha = max(alpha, max_eval)
             if beta <= alpha:
                 break
-        return max_eval, random.choice(best_moves) 
+        return max_eval, random.choice(best_moves) if best_moves else None
     else:
         min_eval = float('inf')
         best_moves = []
@@ -40,7 +47,131 @@ def GA_minimax(position, depth, alpha, beta, max_player, game, evaluation_functi
             beta = min(beta, min_eval)
             if beta <= alpha:
                 break
-        return min_eval, random.choice(best_moves) 
+        return min_eval, random.choice(best_moves) if best_moves else None
+
+
+def GA_minimax_in_place(board, depth, alpha, beta, max_player, evaluation_function, tt=None, budget=None, orderer=None, ply=0, batch=False, stats=None, tablebase=None):
+    # Same search on a single board, using make_move/unmake_move instead of copies
+    if budget is not None:
+        budget.tick()
+    if stats is not None:
+        stats.nodes += 1
+    if tablebase is not None and ply > 0:
+        # Exact scores for the positions the tablebase covers and for finished games
+        score = tablebase.score(board, max_player)
+        if score is not None:
+            if stats is not None:
+                stats.leaves += 1
+            return score, None
+    if depth == 0 or board.winner() is not None:
+        if stats is not None:
+            stats.leaves += 1
+        return evaluation_function(board) + random.uniform(-0.5, 0.5), None
+
+    # Scores are noisy, so the table only orders moves: best move from the previous visit first
+    # With an orderer, randomness only breaks ties between equally scored moves
+    if orderer is not None:
+        moves = orderer.order(board, board.get_move_list(WHITE if max_player else RED), ply)
+    else:
+        moves = get_move_list(board, WHITE if max_player else RED)
+    if tt is not None:
+        key = tt.key(board, max_player)
+        entry = tt.probe(key)
+        if entry is not None and entry[3] in moves:
+            moves.remove(entry[3])
+            moves.insert(0, entry[3])
+    # At the frontier every child is a leaf, so score them all in one numpy pass;
+    # this needs the EvalWeights behind get_optimized_evaluation_function
+    leaf_scores = None
+    if batch and depth == 1 and moves and (tablebase is None or not tablebase.reaches(board)) and hasattr(evaluation_function, 'weights'):
+        from minimax.batch_eval import child_scores
+        leaf_scores = child_scores(board, moves, evaluation_function.weights)
+    if stats is not None and moves:
+        stats.expanded += 1
+
+    if max_player:
+        max_eval = float('-inf')
+        best_moves = []
+        for index, move in enumerate(moves):
+            if stats is not None:
+                stats.children += 1
+            if leaf_scores is not None:
+                if budget is not None:
+                    budget.tick()
+                if stats is not None:
+                    stats.nodes += 1
+                    stats.leaves += 1
+                evaluation = leaf_scores[index] + random.uniform(-0.5, 0.5)
+            else:
+                undo = board.make_move(move)
+                evaluation, _ = GA_minimax_in_place(board, depth-1, alpha, beta, False, evaluation_function, tt, budget, orderer, ply+1, batch, stats, tablebase)
+                board.unmake_move(undo)
+            if evaluation > max_eval:
+                max_eval = evaluation
+                best_moves = [move]
+            elif evaluation == max_eval:
+                best_moves.append(move)
+            alpha = max(alpha, max_eval)
+            if beta <= alpha:
+                if orderer is not None:
+                    orderer.record_cutoff(board, move, ply, depth)
+                if stats is not None:
+                    stats.cutoffs[ply] += 1
+                break
+        value = max_eval
+    else:
+        min_eval = float('inf')
+        best_moves = []
+        for index, move in enumerate(moves):
+            if stats is not None:
+                stats.children += 1
+            if leaf_scores is not None:
+                if budget is not None:
+                    budget.tick()
+                if stats is not None:
+                    stats.nodes += 1
+                    stats.leaves += 1
+                evaluation = leaf_scores[index] + random.uniform(-0.5, 0.5)
+            else:
+                undo = board.make_move(move)
+                evaluation, _ = GA_minimax_in_place(board, depth-1, alpha, beta, True, evaluation_function, tt, budget, orderer, ply+1, batch, stats, tablebase)
+                board.unmake_move(undo)
+            if evaluation < min_eval:
+                min_eval = evaluation
+                best_moves = [move]
+            elif evaluation == min_eval:
+                best_moves.append(move)
+            beta = min(beta, min_eval)
+            if beta <= alpha:
+                if orderer is not None:
+                    orderer.record_cutoff(board, move, ply, depth)
+                if stats is not None:
+                    stats.cutoffs[ply] += 1
+                break
+        value = min_eval
+
+    if not best_moves:
+        # No legal move: a loss for the side to move, as in the other searches
+        return value, None
+    best_move = random.choice(best_moves)
+    if tt is not None:
+        tt.store(key, depth, value, EXACT, best_move)
+    return value, best_move
+
+
+def get_move_list(board, color):
+    moves = board.get_move_list(color)
+    random.shuffle(moves)
+    return moves
+
+
+def play_move(board, move):
+    # Board after move, leaving the searched board untouched
+    if move is None:
+        return None
+    new_board = deepcopy(board)
+    new_board.make_move(move)
+    return new_board
 
 
 def simulate_move(piece, move, board, game, skip):
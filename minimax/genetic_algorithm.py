@@ -1,43 +1,111 @@
+import json
+import os
 import random
 from copy import deepcopy
-from checkers.constants import RED, WHITE
+from checkers.constants import RED, WHITE, ROWS, COLS
 from checkers.game import Game
+from checkers import evaluation
+from checkers.evaluation import EvalWeights, is_protected
 #from minimax.algorithm import GA_minimax, get_all_moves, simulate_move
 
 # Define a default evaluation function
 def default_evaluation(board):
     return board.evaluate()
 
+CHECKPOINT_VERSION = 1
+
+# Used until a tuned set is in the parameter cache: the middle of each random range
+DEFAULT_PARAMS = {'soldier': 0.5, 'queen': 2.0, 'king': 4.0}
+
 # Genetic Algorithm to optimize evaluation function
-def genetic_algorithm(population_size=20, generations=100, mutation_rate=0.1):
-    population = [generate_random_params() for _ in range(population_size)]
-    for _ in range(generations):
-        fitness_scores = [evaluate_fitness(params) for params in population]
-        selected_population = [select(population, fitness_scores) for _ in range(population_size // 2)]
-        offspring = []
-        for i in range(0, len(selected_population), 2):
-            parent1 = selected_population[i]
-            parent2 = selected_population[i + 1] if i + 1 < len(selected_population) else selected_population[0]
-            offspring.extend(crossover(parent1, parent2))
-        population = selected_population + offspring
-        population = [mutate(params, mutation_rate) for params in population]
-    best_params = max(population, key=lambda params: evaluate_fitness(params))
-    return best_params
-
-def generate_random_params():
+def genetic_algorithm(population_size=20, generations=100, mutation_rate=0.1, seed=None, fitness=None, checkpoint=None):
+    """Best parameters after the given number of generations.
+
+    fitness scores a whole population at once (see minimax.self_play.SelfPlayFitness,
+    the default). With a checkpoint path the run is saved after every generation and
+    picks up from there when started again with the same settings.
+    """
+    # A seed makes the run repeatable, which is what the parameter cache is keyed on
+    rng = random.Random(seed) if seed is not None else random
+    own_fitness = fitness is None
+    if own_fitness:
+        from minimax.self_play import SelfPlayFitness
+        fitness = SelfPlayFitness()
+    settings = {'population_size': population_size, 'mutation_rate': mutation_rate, 'seed': seed}
+    saved = load_checkpoint(checkpoint, settings) if checkpoint else None
+    if saved:
+        start, population = saved['generation'], saved['population']
+        rng.setstate(saved['rng'])
+        fitness.scores.update(saved['scores'])
+    else:
+        start, population = 0, [generate_random_params(rng) for _ in range(population_size)]
+    try:
+        for generation in range(start, generations):
+            fitness_scores = fitness.evaluate(population)
+            # Copies, so mutating one survivor never changes another that was picked twice
+            selected_population = [dict(select(population, fitness_scores, rng)) for _ in range(population_size // 2)]
+            offspring = []
+            for i in range(0, len(selected_population), 2):
+                parent1 = selected_population[i]
+                parent2 = selected_population[i + 1] if i + 1 < len(selected_population) else selected_population[0]
+                offspring.extend(crossover(parent1, parent2))
+            population = selected_population + offspring
+            population = [mutate(params, mutation_rate, rng) for params in population]
+            if checkpoint:
+                save_checkpoint(checkpoint, settings, generation + 1, population, rng, fitness.scores)
+        fitness_scores = fitness.evaluate(population)
+        if checkpoint:
+            # Keeps the final scores too, so a longer run resumed from here does not replay them
+            save_checkpoint(checkpoint, settings, generations, population, rng, fitness.scores)
+    finally:
+        if own_fitness:
+            fitness.close()
+    return population[fitness_scores.index(max(fitness_scores))]
+
+def save_checkpoint(path, settings, generation, population, rng, scores):
+    data = {
+        'version': CHECKPOINT_VERSION,
+        'settings': settings,
+        'generation': generation,
+        'population': population,
+        'rng': rng.getstate(),
+        'scores': [[list(key), score] for key, score in scores.items()],
+    }
+    # Write a temporary file and rename it so an interrupted save keeps the last checkpoint
+    temp_path = f'{path}.tmp'
+    with open(temp_path, 'w') as f:
+        json.dump(data, f)
+    os.replace(temp_path, path)
+
+def load_checkpoint(path, settings):
+    """The saved run at path if it was made with the same settings, otherwise None."""
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get('version') != CHECKPOINT_VERSION or data.get('settings') != settings:
+        return None
+    version, state, gauss_next = data['rng']
+    data['rng'] = (version, tuple(state), gauss_next)
+    data['scores'] = {tuple(key): score for key, score in data['scores']}
+    return data
+
+def generate_random_params(rng=random):
     return {
-        'soldier': random.uniform(0, 1),
-        'queen': random.uniform(1, 3),
-        'king': random.uniform(3, 5)
+        'soldier': rng.uniform(0, 1),
+        'queen': rng.uniform(1, 3),
+        'king': rng.uniform(3, 5)
     }
 
 def evaluate_fitness(params):
-    # For simplicity, we'll just return a random fitness score here
-    return random.uniform(0, 1)
+    """Mean self-play score of params against the opponent pool, played in this process."""
+    from minimax.self_play import SelfPlayFitness
+    return SelfPlayFitness(workers=0).evaluate([params])[0]
 
-def select(population, fitness_scores):
+def select(population, fitness_scores, rng=random):
     total_score = sum(fitness_scores)
-    pick = random.uniform(0, total_score)
+    pick = rng.uniform(0, total_score)
     current = 0
     for params, score in zip(population, fitness_scores):
         current += score
@@ -45,11 +113,11 @@ def select(population, fitness_scores):
             return params
     return population[-1]
 
-def mutate(params, mutation_rate):
-    if random.random() < mutation_rate:
-        params['soldier'] += random.uniform(-0.1, 0.1)
-        params['queen'] += random.uniform(-0.1, 0.1)
-        params['king'] += random.uniform(-0.1, 0.1)
+def mutate(params, mutation_rate, rng=random):
+    if rng.random() < mutation_rate:
+        params['soldier'] += rng.uniform(-0.1, 0.1)
+        params['queen'] += rng.uniform(-0.1, 0.1)
+        params['king'] += rng.uniform(-0.1, 0.1)
         # Ensure params stay within reasonable bounds
         params['soldier'] = max(0, params['soldier'])
         params['queen'] = max(1, params['queen'])
@@ -69,60 +137,76 @@ def crossover(params1, params2):
     }
     return new_params1, new_params2
 
+CENTER_COLS = [3, 4]  # Columns considered as center
+ROW_BONUS = 0.1  # Bonus for pieces closer to becoming kings
+CENTER_BONUS = 0.2  # Bonus for controlling the center
+PROTECTION_BONUS = 0.1  # Bonus for a piece with a friendly diagonal neighbour
+
+def get_optimized_weights(params):
+    """The optimized evaluation as per-square tables Board can update incrementally."""
+    tables = {}
+    for type in ('soldier', 'queen', 'king'):
+        white, red = [], []
+        for row in range(ROWS):
+            for col in range(COLS):
+                center = CENTER_BONUS if col in CENTER_COLS else 0
+                white.append(params[type] + (7 - row) * ROW_BONUS + center)
+                red.append(-(params[type] + row * ROW_BONUS + center))
+        tables[(WHITE, type)] = white
+        tables[(RED, type)] = red
+    return EvalWeights(tables, PROTECTION_BONUS)
+
 def get_optimized_evaluation_function(params):
-    def optimized_evaluation(board):
-        white_score = 0
-        red_score = 0
-        center_cols = [3, 4]  # Columns considered as center
-        row_bonus = 0.1  # Bonus for pieces closer to becoming kings
-        center_bonus = 0.2  # Bonus for controlling the center
-
-        for row in board.board:
-            for piece in row:
-                if piece != 0:
-                    # Base score for the piece type
-                    if piece.color == WHITE:
-                        piece_score = params['soldier'] if piece.type == 'soldier' else params['queen'] if piece.type == 'queen' else params['king']
-                        white_score += piece_score
-
-                        # Positioning bonus
-                        white_score += (7 - piece.row) * row_bonus  # Closer to becoming king
-
-                        # Center control bonus
-                        if piece.col in center_cols:
-                            white_score += center_bonus
-
-                        # Piece safety bonus
-                        if is_protected(board, piece):
-                            white_score += 0.1
-                    elif piece.color == RED:
-                        piece_score = params['soldier'] if piece.type == 'soldier' else params['queen'] if piece.type == 'queen' else params['king']
-                        red_score += piece_score
-
-                        # Positioning bonus
-                        red_score += piece.row * row_bonus  # Closer to becoming king
-
-                        # Center control bonus
-                        if piece.col in center_cols:
-                            red_score += center_bonus
-
-                        # Piece safety bonus
-                        if is_protected(board, piece):
-                            red_score += 0.1
-
-        return white_score - red_score
+    weights = get_optimized_weights(params)
 
+    def optimized_evaluation(board):
+        # O(1): the board keeps the weighted score up to date once it knows the weights
+        if board.weights is not weights:
+            board.set_weights(weights)
+        if evaluation.DEBUG:
+            scan = scan_evaluation(board, params)
+            assert abs(board.positional - scan) < 1e-6, f"incremental {board.positional} != scan {scan}"
+        return board.positional
+
+    optimized_evaluation.weights = weights
     return optimized_evaluation
 
-def is_protected(board, piece):
-    """Check if a piece is protected by another piece."""
-    row, col = piece.row, piece.col
-    directions = [(-1, -1), (-1, 1), (1, -1), (1, 1)]  # Diagonal directions
-    for dr, dc in directions:
-        r, c = row + dr, col + dc
-        if 0 <= r < 8 and 0 <= c < 8:
-            neighbor = board.get_piece(r, c)
-            if neighbor != 0 and neighbor.color == piece.color:
-                return True
-    return False
-
+def scan_evaluation(board, params):
+    """Full-board version of the optimized evaluation, kept to check the incremental score."""
+    white_score = 0
+    red_score = 0
+
+    for row in board.board:
+        for piece in row:
+            if piece != 0:
+                # Base score for the piece type
+                if piece.color == WHITE:
+                    piece_score = params['soldier'] if piece.type == 'soldier' else params['queen'] if piece.type == 'queen' else params['king']
+                    white_score += piece_score
+
+                    # Positioning bonus
+                    white_score += (7 - piece.row) * ROW_BONUS  # Closer to becoming king
+
+                    # Center control bonus
+                    if piece.col in CENTER_COLS:
+                        white_score += CENTER_BONUS
+
+                    # Piece safety bonus
+                    if is_protected(board, piece):
+                        white_score += PROTECTION_BONUS
+                elif piece.color == RED:
+                    piece_score = params['soldier'] if piece.type == 'soldier' else params['queen'] if piece.type == 'queen' else params['king']
+                    red_score += piece_score
+
+                    # Positioning bonus
+                    red_score += piece.row * ROW_BONUS  # Closer to becoming king
+
+                    # Center control bonus
+                    if piece.col in CENTER_COLS:
+                        red_score += CENTER_BONUS
+
+                    # Piece safety bonus
+                    if is_protected(board, piece):
+                        red_score += PROTECTION_BONUS
+
+    return white_score - red_score
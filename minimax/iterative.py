@@ -0,0 +1,95 @@
+import time
+from copy import deepcopy
+from minimax.algo import minimax_in_place, play_move
+from minimax.algorithm import alpha_beta_in_place
+from minimax.ga_minimax import GA_minimax_in_place
+from minimax.transposition import TranspositionTable
+from minimax.ordering import MoveOrderer
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+class SearchBudget:
+    """Wall-clock and node limits for one AI move, checked at every search node."""
+
+    def __init__(self, time_limit=None, node_limit=None):
+        self.deadline = time.perf_counter() + time_limit if time_limit is not None else None
+        self.node_limit = node_limit
+        self.nodes = 0
+        self.cancelled = False
+
+    def cancel(self):
+        # Safe to call from another thread; the search stops at its next node
+        self.cancelled = True
+
+    def tick(self):
+        self.nodes += 1
+        if self.cancelled:
+            raise SearchTimeout()
+        if self.node_limit is not None and self.nodes > self.node_limit:
+            raise SearchTimeout()
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            raise SearchTimeout()
+
+
+def alpha_beta_search(board, depth, tt, budget, orderer, stats=None, tablebase=None):
+    return alpha_beta_in_place(board, depth, float('-inf'), float('inf'), True, tt, budget, orderer, stats=stats, tablebase=tablebase)
+
+
+def alpha_beta_quiescence_search(board, depth, tt, budget, orderer, stats=None, tablebase=None):
+    return alpha_beta_in_place(board, depth, float('-inf'), float('inf'), True, tt, budget, orderer, stats=stats, tablebase=tablebase, quiescence=True)
+
+
+def minimax_search(board, depth, tt, budget, orderer, stats=None, tablebase=None):
+    # Nothing is pruned, so ordering would not save any nodes
+    return minimax_in_place(board, depth, True, tt, budget, stats, tablebase)
+
+
+def ga_search(evaluation_function):
+    def search(board, depth, tt, budget, orderer, stats=None, tablebase=None):
+        orderer.randomize = True
+        # Lets the board start its running score before any make/unmake
+        evaluation_function(board)
+        return GA_minimax_in_place(board, depth, float('-inf'), float('inf'), True, evaluation_function, tt, budget, orderer, stats=stats, tablebase=tablebase)
+    return search
+
+
+def iterative_deepening(position, search, time_limit=None, node_limit=None, max_depth=20, tt=None, budget=None, stats=None, tablebase=None):
+    """Search WHITE's move one ply deeper at a time until the budget runs out.
+
+    search is one of the *_search functions above. Returns (value, new_board, depth)
+    from the last iteration that finished. Depth 1 always runs to completion so there
+    is a move to play; the table, killers and history carry each iteration's best
+    line into the next. A SearchBudget can be passed in instead of the limits,
+    e.g. to cancel the search from another thread. A SearchStats passed as stats
+    is filled in as the search runs, and a Tablebase passed as tablebase
+    scores the positions it covers exactly.
+    """
+    if tt is None:
+        tt = TranspositionTable()
+    tt.new_search()
+    if budget is None:
+        budget = SearchBudget(time_limit, node_limit)
+    orderer = MoveOrderer()
+    value, best_move, completed = None, None, 0
+
+    for depth in range(1, max_depth + 1):
+        # An aborted iteration leaves its board half-played, so each one searches a copy
+        board = deepcopy(position)
+        started, nodes_before = time.perf_counter(), stats.nodes if stats is not None else 0
+        try:
+            value, move = search(board, depth, tt, budget if depth > 1 else None, orderer, stats, tablebase)
+        except SearchTimeout:
+            break
+        best_move, completed = move, depth
+        if stats is not None:
+            pv = tt.principal_variation(position, True, depth)
+            if move is not None and pv[:1] != [move]:
+                pv = [move]
+            stats.finish_depth(depth, value, pv, nodes_before, started)
+        if move is None or budget.cancelled:
+            break
+
+    return value, play_move(position, best_move), completed
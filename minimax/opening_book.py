@@ -0,0 +1,166 @@
+import mmap
+import os
+import struct
+from copy import deepcopy
+from checkers.bitboard import BitBoard
+from checkers.constants import RED, WHITE
+from checkers.zobrist import SIDE_TO_MOVE
+from minimax.algorithm import alpha_beta_in_place
+from minimax.ordering import MoveOrderer
+from minimax.transposition import TranspositionTable
+
+# Opening book: WHITE's alpha-beta move for every position reachable in the
+# first few plies, searched offline and read through mmap at runtime.
+#
+# File layout: a header (magic, format version, the start position's key,
+# record count), then fixed-size records sorted by position key:
+# key (u64), from square (u8), to square (u8), captured type (u8, 0 for none),
+# search depth (u8), score (i16).
+
+BOOK_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'opening_book.bin')
+MAGIC = b'CCBOOK'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<6sHQI')
+RECORD = struct.Struct('<QBBBBh')
+CAPTURED_CODES = {None: 0, 'soldier': 1, 'queen': 2, 'king': 3}
+CAPTURED_TYPES = {code: type for type, code in CAPTURED_CODES.items()}
+INFINITY = float('inf')
+
+
+def book_key(board):
+    # The transposition table's key for WHITE to move
+    return board.hash ^ SIDE_TO_MOVE
+
+
+class OpeningBook:
+    """Read-only view of a book file; lookups binary-search the mapped records.
+
+    Opening only maps the file, so it costs the same whatever the book's size.
+    """
+
+    def __init__(self, path=BOOK_PATH):
+        with open(path, 'rb') as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, start_key, self.size = HEADER.unpack_from(self.data, 0)
+        # A book built with other Zobrist keys would silently miss every lookup
+        if magic != MAGIC or version != FORMAT_VERSION or start_key != book_key(BitBoard()):
+            self.data.close()
+            raise ValueError(f"{path} is not an opening book for this version of the game")
+
+    def __len__(self):
+        return self.size
+
+    def close(self):
+        self.data.close()
+
+    def _record(self, index):
+        return RECORD.unpack_from(self.data, HEADER.size + index * RECORD.size)
+
+    def probe(self, key):
+        """(move, depth, score) stored for key, or None."""
+        low, high = 0, self.size
+        while low < high:
+            middle = (low + high) // 2
+            record = self._record(middle)
+            if record[0] < key:
+                low = middle + 1
+            elif record[0] > key:
+                high = middle
+            else:
+                _, origin, target, captured, depth, score = record
+                return (origin, target, CAPTURED_TYPES[captured]), depth, score
+        return None
+
+    def lookup(self, board):
+        """WHITE's book move on board, or None when the position is not in the book."""
+        entry = self.probe(book_key(board))
+        if entry is None or entry[0] not in board.get_move_list(WHITE):
+            return None
+        return entry[0]
+
+
+def open_book(path=BOOK_PATH):
+    """The book at path, or None if there is no usable book there."""
+    try:
+        return OpeningBook(path)
+    except (OSError, ValueError):
+        return None
+
+
+def search_position(board, depth, tt, orderer):
+    # Iterative deepening without a budget, so the table orders each deeper pass
+    for current in range(1, depth + 1):
+        value, move = alpha_beta_in_place(board, current, -INFINITY, INFINITY, True, tt, orderer=orderer)
+    return value, move
+
+
+def build_book(path=BOOK_PATH, plies=4, depth=6, progress=None):
+    """Search every WHITE position in the first plies plies and write the book.
+
+    RED (who moves first) plays every legal move; WHITE plays the book's own
+    choice, so only positions the book can actually lead to are searched.
+    Returns the number of positions in the book.
+    """
+    tt, orderer = TranspositionTable(), MoveOrderer()
+    records = {}
+    frontier = {book_key(BitBoard()): BitBoard()}
+    for ply in range(plies):
+        children = {}
+        for board in frontier.values():
+            if board.winner() is not None:
+                continue
+            if ply % 2 == 0:
+                moves = board.get_move_list(RED)
+            else:
+                moves = [records[book_key(board)][0]]
+            for move in moves:
+                child = deepcopy(board)
+                child.make_move(move)
+                children[child.hash] = child
+        frontier = children
+        if ply % 2 == 0:
+            for index, (key, board) in enumerate(frontier.items()):
+                tt.new_search()
+                value, move = search_position(board, depth, tt, orderer)
+                if move is not None:
+                    records[book_key(board)] = (move, depth, value)
+                if progress:
+                    progress(ply, index + 1, len(frontier))
+
+    with open(f'{path}.tmp', 'wb') as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, book_key(BitBoard()), len(records)))
+        for key in sorted(records):
+            (origin, target, captured), depth, value = records[key]
+            f.write(RECORD.pack(key, origin, target, CAPTURED_CODES[captured], depth, max(-32768, min(32767, int(value)))))
+    os.replace(f'{path}.tmp', path)
+    return len(records)
+
+
+if __name__ == '__main__':
+    # Offline build: python -m minimax.opening_book [--plies N] [--depth N] [--path FILE]
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description='Build the opening book.')
+    parser.add_argument('--plies', type=int, default=4, help='plies from the start position to cover')
+    parser.add_argument('--depth', type=int, default=6, help='alpha-beta depth for every book position')
+    parser.add_argument('--path', default=BOOK_PATH)
+    args = parser.parse_args()
+
+    def progress(ply, done, total):
+        if done % 50 == 0 or done == total:
+            print(f"ply {ply + 1}: {done}/{total} positions searched")
+
+    start = time.perf_counter()
+    size = build_book(args.path, args.plies, args.depth, progress)
+    print(f"{size} positions written to {args.path} in {time.perf_counter() - start:.1f}s")
+
+    start = time.perf_counter()
+    book = OpeningBook(args.path)
+    opened = time.perf_counter() - start
+    board = BitBoard()
+    board.make_move(board.get_move_list(RED)[0])
+    start = time.perf_counter()
+    for _ in range(1000):
+        move = book.lookup(board)
+    print(f"opened in {opened * 1e6:.0f}us, lookup {(time.perf_counter() - start) * 1e3:.1f}us: {move}")
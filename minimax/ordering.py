@@ -0,0 +1,81 @@
+import random
+from checkers.constants import COLS
+from checkers.evaluation import PIECE_VALUES
+
+CAPTURE_SCORE = 1 << 30
+KILLER_SCORE = 1 << 29
+
+
+class MoveOrderer:
+    """Orders moves for alpha-beta: captures (best victim, cheapest attacker),
+    then this ply's killer moves, then quiet moves by history score.
+
+    One orderer is meant to live for a whole AI move so killers and history
+    carry over between iterative deepening iterations.
+    """
+
+    def __init__(self, randomize=False):
+        # randomize breaks ties between equally scored moves at random
+        self.randomize = randomize
+        self.killers = {}
+        self.history = {}
+
+    def score(self, board, move, ply):
+        origin, _, captured = move
+        if captured is not None:
+            attacker = board.get_piece(*divmod(origin, COLS))
+            return CAPTURE_SCORE + PIECE_VALUES[captured] * 16 - PIECE_VALUES[attacker.type]
+        killers = self.killers.get(ply, ())
+        if move in killers:
+            return KILLER_SCORE - killers.index(move)
+        return self.history.get(move, 0)
+
+    def order(self, board, moves, ply):
+        if self.randomize:
+            keyed = [(self.score(board, move, ply), random.random(), move) for move in moves]
+        else:
+            # Negative index keeps board-scan order between equal scores
+            keyed = [(self.score(board, move, ply), -index, move) for index, move in enumerate(moves)]
+        keyed.sort(key=lambda item: (item[0], item[1]), reverse=True)
+        return [move for _, _, move in keyed]
+
+    def record_cutoff(self, board, move, ply, depth):
+        # Captures are already tried first, only quiet moves become killers
+        if move[2] is not None:
+            return
+        killers = self.killers.setdefault(ply, [])
+        if move not in killers:
+            killers.insert(0, move)
+            del killers[2:]
+        self.history[move] = self.history.get(move, 0) + depth * depth
+
+
+if __name__ == '__main__':
+    # Nodes searched at fixed depth, scan order against ordered moves
+    from copy import deepcopy
+    from checkers.board import Board
+    from checkers.constants import RED, WHITE
+    from minimax.algorithm import alpha_beta_in_place
+    from minimax.iterative import SearchBudget
+
+    random.seed(1)
+    positions = []
+    board, color = Board(), WHITE
+    for ply in range(30):
+        moves = board.get_move_list(color)
+        if not moves or board.winner() is not None:
+            break
+        board.make_move(random.choice(moves))
+        color = RED if color == WHITE else WHITE
+        if ply in (0, 9, 19, 29):
+            positions.append((ply + 1, deepcopy(board)))
+
+    for depth in (3, 4, 5):
+        for played, position in positions:
+            counts = []
+            for orderer in (None, MoveOrderer()):
+                budget = SearchBudget()
+                alpha_beta_in_place(position, depth, float('-inf'), float('inf'), True, None, budget, orderer)
+                counts.append(budget.nodes)
+            print(f"depth {depth} after {played:2d} plies: {counts[0]:7d} nodes unordered, "
+                  f"{counts[1]:7d} ordered ({1 - counts[1] / counts[0]:.0%} fewer)")
@@ -0,0 +1,106 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from minimax.algorithm import alpha_beta_in_place, play_move
+
+WHITE = (255, 255, 255)
+
+
+def search_root_move(board, move, depth, alpha, beta):
+    # Runs in a worker: value of WHITE's root move, RED to reply
+    board.make_move(move)
+    value, _ = alpha_beta_in_place(board, depth - 1, alpha, beta, False)
+    return value
+
+
+class RootParallelSearch:
+    """alpha_beta_minimax for WHITE with the root moves spread over a process pool.
+
+    The pool is created once and reused for every move, so only the first
+    search pays for starting the workers. Call close() when done.
+    """
+
+    def __init__(self, workers=None):
+        self.workers = workers or os.cpu_count()
+        self.executor = ProcessPoolExecutor(max_workers=self.workers)
+
+    def close(self):
+        self.executor.shutdown(cancel_futures=True)
+
+    def search(self, position, depth, alpha=float('-inf'), beta=float('inf')):
+        """Same (value, new_board) as alpha_beta_minimax(position, depth, alpha, beta, True, game, in_place=True)."""
+        if depth == 0 or position.winner() is not None:
+            return position.evaluate(), position
+        moves = position.get_move_list(WHITE)
+        if not moves:
+            return float('-inf'), None
+
+        # The first move is searched on its own so the others start with a real alpha
+        results = {0: (alpha, self.executor.submit(search_root_move, position, moves[0], depth, alpha, beta).result())}
+        shared_alpha = max(alpha, results[0][1])
+        pending = {}
+        next_index = 1
+        while next_index < len(moves) or pending:
+            while next_index < len(moves) and len(pending) < self.workers and shared_alpha < beta:
+                future = self.executor.submit(search_root_move, position, moves[next_index], depth, shared_alpha, beta)
+                pending[future] = (next_index, shared_alpha)
+                next_index += 1
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, window_alpha = pending.pop(future)
+                results[index] = (window_alpha, future.result())
+                # Every result is exact or already below alpha, so it is a safe lower bound
+                shared_alpha = max(shared_alpha, results[index][1])
+
+        return self._replay(position, moves, depth, alpha, beta, results)
+
+    def _replay(self, position, moves, depth, alpha, beta, results):
+        # Walk the moves in order as the sequential search would. A worker value
+        # can be reused when it was searched with the same alpha, or when it is
+        # exact for both windows; anything else is searched again here.
+        max_eval = float('-inf')
+        best_move = None
+        for index, move in enumerate(moves):
+            window_alpha, value = results.get(index, (None, None))
+            if value is None or not (window_alpha == alpha or max(window_alpha, alpha) < value < beta):
+                undo = position.make_move(move)
+                value, _ = alpha_beta_in_place(position, depth - 1, alpha, beta, False)
+                position.unmake_move(undo)
+            max_eval = max(max_eval, value)
+            if max_eval == value:
+                best_move = move
+            alpha = max(alpha, max_eval)
+            if beta <= alpha:
+                break
+        return max_eval, play_move(position, best_move)
+
+
+if __name__ == '__main__':
+    # Speedup over the sequential search for 1/2/4/8 workers
+    import random
+    import time
+    from copy import deepcopy
+    from checkers.bitboard import BitBoard
+
+    RED = (255, 0, 0)
+    random.seed(7)
+    board, color = BitBoard(), WHITE
+    for _ in range(12):
+        board.make_move(random.choice(board.get_move_list(color)))
+        color = RED if color == WHITE else WHITE
+
+    depth = 5
+    start = time.perf_counter()
+    sequential = alpha_beta_in_place(deepcopy(board), depth, float('-inf'), float('inf'), True)
+    baseline = time.perf_counter() - start
+    print(f"sequential: {baseline:.2f}s ({os.cpu_count()} cores available)")
+    for workers in (1, 2, 4, 8):
+        parallel = RootParallelSearch(workers)
+        parallel.search(board, 1)  # start the workers before timing
+        start = time.perf_counter()
+        value, new_board = parallel.search(board, depth)
+        elapsed = time.perf_counter() - start
+        parallel.close()
+        same = value == sequential[0] and new_board.hash == play_move(board, sequential[1]).hash
+        print(f"{workers} workers: {elapsed:.2f}s, speedup {baseline / elapsed:.2f}x, same move: {same}")
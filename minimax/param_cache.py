@@ -0,0 +1,79 @@
+import json
+import os
+import time
+from minimax.genetic_algorithm import genetic_algorithm, DEFAULT_PARAMS
+
+# Tuned GA parameters on disk, one entry per GA configuration and seed.
+# Bump CACHE_VERSION whenever the GA or its fitness function changes so old
+# results are ignored instead of loaded.
+CACHE_VERSION = 2
+CACHE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'ga_params.json')
+DEFAULT_SEED = 0
+DEFAULT_CONFIG = {'population_size': 20, 'generations': 100, 'mutation_rate': 0.1}
+
+
+def cache_key(config, seed):
+    return json.dumps({'config': dict(DEFAULT_CONFIG, **config), 'seed': seed}, sort_keys=True)
+
+
+def _read(path):
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get('version') != CACHE_VERSION:
+        return {}
+    return data.get('entries', {})
+
+
+def load_params(seed=DEFAULT_SEED, path=CACHE_PATH, **config):
+    """Cached parameters for this GA configuration and seed, or None."""
+    entry = _read(path).get(cache_key(config, seed))
+    return entry['params'] if entry else None
+
+
+def store_params(params, seed=DEFAULT_SEED, path=CACHE_PATH, **config):
+    entries = _read(path)
+    entries[cache_key(config, seed)] = {'params': params, 'tuned_at': time.time()}
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Write a temporary file and rename it so a reader never sees half a file
+    temp_path = f'{path}.{os.getpid()}.tmp'
+    with open(temp_path, 'w') as f:
+        json.dump({'version': CACHE_VERSION, 'entries': entries}, f, indent=2, sort_keys=True)
+    os.replace(temp_path, path)
+
+
+def tune(seed=DEFAULT_SEED, path=CACHE_PATH, checkpoint=None, **config):
+    """Run the GA for this configuration and seed and cache the result."""
+    params = genetic_algorithm(seed=seed, checkpoint=checkpoint, **dict(DEFAULT_CONFIG, **config))
+    store_params(params, seed, path, **config)
+    return params
+
+
+def get_params(seed=DEFAULT_SEED, path=CACHE_PATH, **config):
+    """(params, cached): the tuned parameters if cached, DEFAULT_PARAMS otherwise."""
+    params = load_params(seed, path, **config)
+    if params is None:
+        return dict(DEFAULT_PARAMS), False
+    return params, True
+
+
+if __name__ == '__main__':
+    # Offline retune: python -m minimax.param_cache [--seed N] [--generations N] ...
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Run the genetic algorithm and cache the tuned parameters.')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--population-size', type=int, default=DEFAULT_CONFIG['population_size'])
+    parser.add_argument('--generations', type=int, default=DEFAULT_CONFIG['generations'])
+    parser.add_argument('--mutation-rate', type=float, default=DEFAULT_CONFIG['mutation_rate'])
+    parser.add_argument('--path', default=CACHE_PATH)
+    parser.add_argument('--checkpoint', help='save progress here after every generation and resume from it')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    params = tune(args.seed, args.path, args.checkpoint, population_size=args.population_size,
+                  generations=args.generations, mutation_rate=args.mutation_rate)
+    print(f"tuned in {time.perf_counter() - start:.2f}s: {params}")
+    print(f"saved to {args.path}")
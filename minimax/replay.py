@@ -0,0 +1,104 @@
+import random
+from checkers.constants import WHITE
+from checkers.record import RECORDS_PATH, load_records, replay, side_to_move, find_move
+from minimax.arena import ga_minimax_search
+from minimax.iterative import iterative_deepening, alpha_beta_search, minimax_search
+from minimax.stats import SearchStats
+from minimax.transposition import TranspositionTable
+
+# Headless replay of the games main.py records: rebuild any position, and run
+# the AI's search there again, with the seed and depth it had in the game,
+# for debugging and profiling.
+
+SEARCHES = {
+    'Easy': ga_minimax_search,
+    'Medium': lambda: minimax_search,
+    'Hard': lambda: alpha_beta_search,
+}
+DEFAULT_DEPTH = 4  # for plies the record has no search depth for, such as book moves
+
+
+def recorded_depth(record, ply):
+    for search in record.searches:
+        if search['ply'] == ply:
+            return search['depth']
+    return None
+
+
+def rerun_search(record, ply, depth=None, tablebase=None):
+    """(move, depth, stats) from the record's AI searching its move at ply again.
+
+    random is seeded as it was in the game and the search goes to the depth
+    it finished there, without a time limit. The transposition table starts
+    empty rather than warm from earlier moves, so the chosen move can still
+    differ between equally scored moves.
+    """
+    if side_to_move(ply) != WHITE:
+        raise ValueError(f"ply {ply} is RED's move; the AI plays WHITE, at odd plies")
+    board = replay(record, ply)
+    random.seed(record.search_seed(ply))
+    stats = SearchStats()
+    if record.difficulty == 'Very Hard':
+        from minimax.fuzzy import determine_best_fuzzy_move
+        new_board = determine_best_fuzzy_move(board)
+        return (find_move(board, WHITE, new_board) if new_board is not None else None), None, stats
+    depth = depth or recorded_depth(record, ply) or DEFAULT_DEPTH
+    _, new_board, depth = iterative_deepening(board, SEARCHES[record.difficulty](), max_depth=depth,
+                                              tt=TranspositionTable(), stats=stats, tablebase=tablebase)
+    return (find_move(board, WHITE, new_board) if new_board is not None else None), depth, stats
+
+
+if __name__ == '__main__':
+    # python -m minimax.replay [--game N] [--ply P]             print the position at ply P of game N
+    # python -m minimax.replay --ply P --search [--profile]     run the AI's search at that ply again
+    # python -m minimax.replay --bench                          replay every recorded game, timed
+    import argparse
+    import time
+    from checkers.positions import layout
+
+    parser = argparse.ArgumentParser(description='Replay recorded games.')
+    parser.add_argument('--records', default=RECORDS_PATH)
+    parser.add_argument('--game', type=int, default=-1, help='index of the game in the records file, the last by default')
+    parser.add_argument('--ply', type=int, default=None, help='moves to replay, all by default')
+    parser.add_argument('--search', action='store_true', help="run the AI's search at --ply again")
+    parser.add_argument('--depth', type=int, default=None, help='search depth instead of the recorded one')
+    parser.add_argument('--tablebase', action='store_true', help='probe the endgame tablebase, as main.py does when one is built')
+    parser.add_argument('--profile', action='store_true', help='run the search under cProfile')
+    parser.add_argument('--bench', action='store_true', help='time replaying every game in the file')
+    args = parser.parse_args()
+
+    records = load_records(args.records)
+    if args.bench:
+        start = time.perf_counter()
+        for record in records:
+            replay(record)
+        seconds = time.perf_counter() - start
+        moves = sum(len(record) for record in records)
+        print(f"{len(records)} games, {moves} moves replayed in {seconds * 1000:.1f} ms ({moves / seconds:.0f} moves/s)")
+        raise SystemExit
+
+    record = records[args.game]
+    ply = len(record) if args.ply is None else args.ply
+    print(f"{record.difficulty} game, seed {record.seed}, {len(record)} plies, winner {record.result}")
+    board = replay(record, ply)
+    print(f"after ply {ply}:")
+    print('\n'.join(layout(board)))
+
+    if args.search:
+        tablebase = None
+        if args.tablebase:
+            from minimax.tablebase import open_tablebase
+            tablebase = open_tablebase()
+        if args.profile:
+            import cProfile
+            import pstats
+            profiler = cProfile.Profile()
+            move, depth, stats = profiler.runcall(rerun_search, record, ply, args.depth, tablebase)
+            pstats.Stats(profiler).sort_stats('cumulative').print_stats(25)
+        else:
+            move, depth, stats = rerun_search(record, ply, args.depth, tablebase)
+        played = tuple(record.moves[ply]) if ply < len(record) else None
+        if depth is None:
+            print(f"fuzzy move {move}, played in the game {played}")
+        else:
+            print(f"searched to depth {depth}: {move}, played in the game {played}; {stats.summary()}")
@@ -0,0 +1,153 @@
+import multiprocessing
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from checkers.bitboard import BitBoard
+from checkers.constants import RED, WHITE
+from minimax.algorithm import alpha_beta_in_place
+from minimax.ga_minimax import GA_minimax_in_place
+from minimax.genetic_algorithm import get_optimized_evaluation_function, DEFAULT_PARAMS
+
+# Fitness for the genetic algorithm: the candidate's evaluation plays WHITE
+# through GA_minimax against a fixed pool of RED opponents.
+
+SEARCH_DEPTH = 2
+MAX_MOVES = 200  # plies; a game still running after this is scored by material
+OPENING_PLIES = 2  # random moves before the engines take over, picked by the game's seed
+INFINITY = float('inf')
+
+
+def random_opponent(board):
+    moves = board.get_move_list(RED)
+    return random.choice(moves) if moves else None
+
+
+def alpha_beta_opponent(depth):
+    def opponent(board):
+        return alpha_beta_in_place(board, depth, -INFINITY, INFINITY, False)[1]
+    return opponent
+
+
+def ga_opponent(params, depth):
+    evaluation_function = get_optimized_evaluation_function(params)
+
+    def opponent(board):
+        evaluation_function(board)
+        return GA_minimax_in_place(board, depth, -INFINITY, INFINITY, False, evaluation_function)[1]
+    return opponent
+
+
+OPPONENTS = {
+    'random': random_opponent,
+    'material': alpha_beta_opponent(2),
+    'default': ga_opponent(DEFAULT_PARAMS, SEARCH_DEPTH),
+}
+
+
+def game_score(board):
+    """1 for a WHITE win, 0 for a loss, otherwise 0.1-0.9 by material."""
+    winner = board.winner()
+    if winner == WHITE:
+        return 1.0
+    if winner == RED:
+        return 0.0
+    return 0.5 + max(-0.4, min(0.4, board.evaluate() / 50))
+
+
+def play_game(params, opponent, seed, depth=SEARCH_DEPTH, max_moves=MAX_MOVES):
+    """Score of one game between params (WHITE) and OPPONENTS[opponent] (RED), RED moving first.
+
+    All randomness comes from seed, so the same arguments always give the same score.
+    """
+    state = random.getstate()
+    random.seed(seed)
+    try:
+        board = BitBoard()
+        evaluation_function = get_optimized_evaluation_function(params)
+        color = RED
+        for ply in range(max_moves):
+            if board.winner() is not None:
+                break
+            moves = board.get_move_list(color)
+            if not moves:
+                break
+            if ply < OPENING_PLIES:
+                move = random.choice(moves)
+            elif color == WHITE:
+                evaluation_function(board)
+                move = GA_minimax_in_place(board, depth, -INFINITY, INFINITY, True, evaluation_function)[1]
+            else:
+                move = OPPONENTS[opponent](board)
+            if move is None:
+                break
+            board.make_move(move)
+            color = RED if color == WHITE else WHITE
+        return game_score(board)
+    finally:
+        random.setstate(state)
+
+
+def params_key(params):
+    return (params['soldier'], params['queen'], params['king'])
+
+
+class SelfPlayFitness:
+    """Mean self-play score for each candidate, with games spread over a process pool.
+
+    Every candidate plays the same games (games_per_opponent seeds against each
+    opponent), so scores are comparable and depend on the parameters alone.
+    They are kept in scores, keyed by params_key, and candidates that survive
+    a generation are not played again. workers=0 plays in this process.
+    Call close() when done.
+    """
+
+    def __init__(self, workers=None, opponents=tuple(OPPONENTS), games_per_opponent=2, depth=SEARCH_DEPTH, max_moves=MAX_MOVES):
+        self.workers = os.cpu_count() if workers is None else workers
+        self.games = [(opponent, seed) for opponent in opponents for seed in range(games_per_opponent)]
+        self.depth = depth
+        self.max_moves = max_moves
+        self.scores = {}
+        self.games_played = 0
+        self.executor = None
+        if self.workers:
+            # The rules core has no pygame import, so spawned workers start quickly
+            # and never inherit the game window or its threads
+            self.executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context('spawn'))
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+
+    def evaluate(self, population):
+        """Fitness of every candidate in population, playing only the ones not seen before."""
+        new = list({params_key(params): params for params in population if params_key(params) not in self.scores}.items())
+        jobs = [(params, opponent, seed, self.depth, self.max_moves) for _, params in new for opponent, seed in self.games]
+        if self.executor is not None:
+            results = list(self.executor.map(play_game, *zip(*jobs), chunksize=max(1, len(jobs) // (4 * self.workers)))) if jobs else []
+        else:
+            results = [play_game(*job) for job in jobs]
+        self.games_played += len(jobs)
+        for index, (key, _) in enumerate(new):
+            game_scores = results[index * len(self.games):(index + 1) * len(self.games)]
+            self.scores[key] = sum(game_scores) / len(game_scores)
+        return [self.scores[params_key(params)] for params in population]
+
+
+if __name__ == '__main__':
+    # Self-play throughput in this process and with 1/2/4 workers on the same candidates
+    import time
+    from minimax.genetic_algorithm import generate_random_params
+
+    rng = random.Random(1)
+    population = [generate_random_params(rng) for _ in range(4)]
+    print(f"{os.cpu_count()} cores available")
+    for workers in (0, 1, 2, 4):
+        fitness = SelfPlayFitness(workers)
+        fitness.evaluate([DEFAULT_PARAMS])  # start the workers before timing
+        fitness.games_played = 0
+        start = time.perf_counter()
+        scores = fitness.evaluate(population)
+        elapsed = time.perf_counter() - start
+        fitness.close()
+        print(f"{workers} workers: {fitness.games_played} games in {elapsed:.2f}s, "
+              f"{fitness.games_played / elapsed:.1f} games/s, best {max(scores):.3f}")
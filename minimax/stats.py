@@ -0,0 +1,59 @@
+import json
+import time
+from collections import Counter
+
+
+class SearchStats:
+    """What one AI move's search did, filled in by the *_in_place searches.
+
+    nodes counts every position entered and leaves the ones evaluated. The
+    branching factor counts only the moves actually searched, so pruning makes
+    it smaller. iterative_deepening adds one entry to depths per finished
+    iteration, with its time, nodes, value and principal variation.
+    """
+
+    def __init__(self):
+        self.nodes = 0
+        self.leaves = 0
+        self.quiescence_nodes = 0  # of nodes, those searched past the horizon
+        self.cutoffs = Counter()  # beta cutoffs by ply
+        self.expanded = 0  # positions whose moves were generated
+        self.children = 0  # moves searched from those positions
+        self.depths = []
+        self.pv = []
+        self.started = time.perf_counter()
+
+    @property
+    def branching_factor(self):
+        return self.children / self.expanded if self.expanded else 0.0
+
+    @property
+    def seconds(self):
+        return time.perf_counter() - self.started
+
+    def finish_depth(self, depth, value, pv, nodes_before, started):
+        self.depths.append({'depth': depth, 'seconds': time.perf_counter() - started,
+                            'nodes': self.nodes - nodes_before, 'value': value, 'pv': pv})
+        self.pv = pv
+
+    def to_dict(self):
+        return {
+            'nodes': self.nodes,
+            'leaves': self.leaves,
+            'quiescence_nodes': self.quiescence_nodes,
+            'cutoffs': {str(ply): count for ply, count in sorted(self.cutoffs.items())},
+            'branching_factor': round(self.branching_factor, 3),
+            'seconds': self.seconds,
+            'depths': self.depths,
+            'pv': self.pv,
+        }
+
+    def summary(self):
+        nps = self.nodes / self.seconds if self.seconds else 0
+        return (f"{self.nodes} nodes ({self.quiescence_nodes} quiescence), {self.leaves} leaves, {nps:.0f} nodes/s, "
+                f"branching {self.branching_factor:.2f}, pv {self.pv}")
+
+    def log(self, path, **extra):
+        """Append the stats, plus any extra fields, to path as one JSON line."""
+        with open(path, 'a') as f:
+            f.write(json.dumps(dict(self.to_dict(), **extra)) + '\n')
@@ -0,0 +1,316 @@
+import mmap
+import os
+import struct
+from itertools import combinations_with_replacement
+from checkers.constants import ROWS, COLS, RED, WHITE
+from checkers.move_tables import TARGETS
+
+# Endgame tablebase: the exact result of every position with up to a few
+# pieces, worked out backwards from the finished games (retrograde analysis)
+# and read through mmap by the searches.
+#
+# Positions are grouped by material, a signature of the kinds on the board in
+# KINDS order. A signature with n pieces has one byte per side to move and
+# placement, at side * 81**n + sum(square_i * 81**i) with the squares in
+# signature order. The byte is 0 for a draw (or a placement that cannot
+# happen), otherwise the plies to the end of the game plus one: an odd number
+# of plies means the side to move wins, an even number that it loses. A side
+# with no move left loses, as in the searches.
+#
+# File layout: a header (magic, format version, most pieces, table count),
+# a directory entry per table (piece count, kinds, offset), then the tables.
+
+TABLEBASE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'tablebase.bin')
+MAGIC = b'CCTBASE'
+FORMAT_VERSION = 1  # bump whenever the rules change
+HEADER = struct.Struct('<7sBBI')
+ENTRY = struct.Struct('<B3sQ')
+SQUARES = ROWS * COLS
+# Tables are dense, so four pieces would take 2 * 81**4 bytes (86 MB) per signature
+MAX_PIECES = 3
+KINDS = ((WHITE, 'soldier'), (WHITE, 'queen'), (WHITE, 'king'), (RED, 'soldier'), (RED, 'queen'), (RED, 'king'))
+KIND_INDEX = {kind: index for index, kind in enumerate(KINDS)}
+# Search score of a won position, less the plies it takes, so shorter wins score higher
+WIN_SCORE = 1000
+
+
+def decode(value):
+    """(result, plies) for a stored byte; result is 1 if the side to move wins, -1 if it loses, 0 for a draw."""
+    if value == 0:
+        return 0, None
+    plies = value - 1
+    return (1 if plies % 2 else -1), plies
+
+
+class Tablebase:
+    """Read-only view of a tablebase file."""
+
+    def __init__(self, path=TABLEBASE_PATH):
+        with open(path, 'rb') as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.pieces, count = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self.data.close()
+            raise ValueError(f"{path} is not a tablebase for this version of the game")
+        self.tables = {}
+        for index in range(count):
+            n, kinds, offset = ENTRY.unpack_from(self.data, HEADER.size + index * ENTRY.size)
+            self.tables[tuple(kinds[:n])] = offset
+
+    def close(self):
+        self.data.close()
+
+    def probe(self, board, color):
+        """(result, plies) for color to move on board as from decode, or None if board has too many pieces."""
+        if board.red_left + board.white_left > self.pieces:
+            return None
+        pieces = sorted((KIND_INDEX[(piece.color, piece.type)], piece.row * COLS + piece.col)
+                        for piece in board.get_all_pieces(WHITE) + board.get_all_pieces(RED))
+        offset = self.tables.get(tuple(kind for kind, _ in pieces))
+        if offset is None:
+            return None
+        index = 0 if color == WHITE else SQUARES ** len(pieces)
+        for place, (_, square) in enumerate(pieces):
+            index += square * SQUARES ** place
+        return decode(self.data[offset + index])
+
+    def reaches(self, board):
+        # True if board or a position one move away can be in the tablebase
+        return board.red_left + board.white_left <= self.pieces + 1
+
+    def score(self, board, max_player):
+        """Search score of board from WHITE's side, or None if the position is not in the tablebase.
+
+        A finished game scores WIN_SCORE, so taking the last piece beats any
+        win the tablebase still has to play out.
+        """
+        winner = board.winner()
+        if winner is not None:
+            return WIN_SCORE if winner == WHITE else -WIN_SCORE
+        entry = self.probe(board, WHITE if max_player else RED)
+        if entry is None:
+            return None
+        result, plies = entry
+        if result == 0:
+            return 0
+        score = result * (WIN_SCORE - plies)
+        return score if max_player else -score
+
+
+def open_tablebase(path=TABLEBASE_PATH):
+    """The tablebase at path, or None if there is no usable one there."""
+    try:
+        return Tablebase(path)
+    except (OSError, ValueError):
+        return None
+
+
+def signatures(pieces):
+    """Every signature with this many pieces and both colors on the board, in build order.
+
+    Captures lead to fewer pieces and promotions to more kings, so building
+    by piece count and then by pieces still to promote builds every table
+    after the ones its moves can reach.
+    """
+    found = []
+    for kinds in combinations_with_replacement(range(len(KINDS)), pieces):
+        colors = {KINDS[kind][0] for kind in kinds}
+        if len(colors) == 2:
+            found.append(kinds)
+    return sorted(found, key=lambda kinds: sum(KINDS[kind][1] != 'king' for kind in kinds))
+
+
+def target_arrays():
+    # TARGETS as one (81, 8) array of target squares per kind, -1 past the last target
+    import numpy as np
+    arrays = []
+    for kind in KINDS:
+        array = np.full((SQUARES, 8), -1, np.int64)
+        for square, targets in enumerate(TARGETS[kind]):
+            for slot, (target, _, _) in enumerate(targets):
+                array[square, slot] = target
+        arrays.append(array)
+    return arrays
+
+
+def build_table(kinds, tables, targets):
+    """The bytes of the table for signature kinds, given every table its moves can reach.
+
+    Moves that capture or promote leave the signature, so their results are
+    read from tables. The rest stay inside it: their results are filled in
+    ply by ply, wins in n plies first needing a child lost in n - 1, losses in
+    n plies once every child is won and the longest takes n - 1. Whatever is
+    still open at the end is a draw.
+    """
+    import numpy as np
+    n = len(kinds)
+    size = SQUARES ** n
+    places = np.arange(size)
+    squares = [places // SQUARES ** i % SQUARES for i in range(n)]
+    promotion_rows = np.zeros(SQUARES, bool)
+    promotion_rows[:COLS] = promotion_rows[-COLS:] = True
+    legal = np.ones(size, bool)
+    for i in range(n):
+        for other in range(i):
+            legal &= squares[i] != squares[other]
+        if KINDS[kinds[i]][1] != 'king':
+            legal &= ~promotion_rows[squares[i]]
+
+    # One extra slot past the end stands in for missing moves: a child won in
+    # one ply changes neither test below
+    values = np.zeros(2 * size + 1, np.int16)
+    values[-1] = 2
+    sides, last_outside = [], 0
+    for side, color in enumerate((WHITE, RED)):
+        own = [i for i in range(n) if KINDS[kinds[i]][0] == color]
+        enemy = [i for i in range(n) if KINDS[kinds[i]][0] != color]
+        child_base = (1 - side) * size
+        children = []
+        # Best results among the moves that leave the signature, as a stored child byte
+        quickest_win = np.full(size, 256, np.int16)  # child lost soonest
+        longest_loss = np.zeros(size, np.int16)  # child won latest
+        draw = np.zeros(size, bool)
+        has_move = np.zeros(size, bool)
+        for i in own:
+            kind = kinds[i]
+            type = KINDS[kind][1]
+            for slot in range(8):
+                target = targets[kind][squares[i], slot]
+                valid = legal & (target >= 0)
+                for other in own:
+                    if other != i:
+                        valid &= target != squares[other]
+                if not valid.any():
+                    continue
+                has_move |= valid
+                promoting = promotion_rows[target] if type != 'king' else np.zeros(size, bool)
+                captures = [(e, valid & (target == squares[e])) for e in enemy]
+                quiet = valid
+                for _, captured in captures:
+                    quiet = quiet & ~captured
+
+                child = np.full(size, 2 * size)
+                stays = quiet & ~promoting
+                child[stays] = (child_base + places + (target - squares[i]) * SQUARES ** i)[stays]
+                children.append(child)
+
+                for captured, moves in [(None, quiet)] + captures:
+                    for promotes in (False, True):
+                        rows = np.nonzero(moves & (promoting if promotes else ~promoting))[0]
+                        if (captured is None and not promotes) or not len(rows):
+                            continue
+                        result = child_values(kinds, i, target, captured, promotes, side, rows, squares, tables)
+                        draw[rows] |= result == 0
+                        lost = result % 2 == 1
+                        quickest_win[rows[lost]] = np.minimum(quickest_win[rows[lost]], result[lost])
+                        won = (result > 0) & ~lost
+                        longest_loss[rows[won]] = np.maximum(longest_loss[rows[won]], result[won])
+
+        last_outside = max(last_outside, int(longest_loss.max()), int(quickest_win[quickest_win < 256].max(initial=0)))
+        values[side * size + np.nonzero(legal & ~has_move)[0]] = 1
+        open_positions = np.nonzero(legal & has_move)[0]
+        sides.append([side * size + open_positions,
+                      np.stack(children, axis=1)[open_positions] if children else np.zeros((len(open_positions), 0), np.int64),
+                      quickest_win[open_positions], longest_loss[open_positions], draw[open_positions]])
+
+    plies = 1
+    while True:
+        updates = []
+        for entry in sides:
+            positions, children, quickest_win, longest_loss, draw = entry
+            child = values[children]
+            if plies % 2:
+                done = (quickest_win == plies) | (child == plies).any(axis=1)
+            else:
+                all_won = ((child > 0) & (child % 2 == 0)).all(axis=1) & ~draw & (quickest_win == 256)
+                longest = np.maximum(child.max(axis=1, initial=0), longest_loss)
+                done = all_won & (longest == plies)
+            updates.append(positions[done])
+            keep = ~done
+            entry[:] = [positions[keep], children[keep], quickest_win[keep], longest_loss[keep], draw[keep]]
+        finished = sum(len(update) for update in updates)
+        if finished and plies > 254:
+            raise ValueError(f"signature {kinds} has results longer than a byte can hold")
+        for update in updates:
+            values[update] = plies + 1
+        if not finished and plies >= last_outside:
+            break
+        plies += 1
+    return values[:-1].astype(np.uint8)
+
+
+def child_values(kinds, mover, target, captured, promotes, side, rows, squares, tables):
+    # Stored bytes of the children reached by moving piece mover to target in
+    # rows, capturing piece captured and promoting as told
+    import numpy as np
+    pieces = []
+    for i, kind in enumerate(kinds):
+        if i == captured:
+            continue
+        square = target[rows] if i == mover else squares[i][rows]
+        if i == mover and promotes:
+            kind = KIND_INDEX[(KINDS[kind][0], 'king')]
+        pieces.append((kind, square))
+    if len({KINDS[kind][0] for kind, _ in pieces}) < 2:
+        # The last enemy piece was taken: the child's side to move has lost
+        return np.ones(len(rows), np.int16)
+    pieces.sort(key=lambda piece: piece[0])
+    child_kinds = tuple(kind for kind, _ in pieces)
+    index = (1 - side) * SQUARES ** len(pieces)
+    for place, (_, square) in enumerate(pieces):
+        index = index + square * SQUARES ** place
+    return tables[child_kinds][index].astype(np.int16)
+
+
+def build_tablebase(path=TABLEBASE_PATH, pieces=MAX_PIECES, progress=None):
+    """Build every table with up to pieces pieces and write them to path.
+
+    Returns {piece count: (tables, bytes, seconds)} for the report.
+    """
+    import time
+    if not 2 <= pieces <= MAX_PIECES:
+        raise ValueError(f"tablebases cover 2 to {MAX_PIECES} pieces")
+    targets = target_arrays()
+    tables, report = {}, {}
+    for n in range(2, pieces + 1):
+        start = time.perf_counter()
+        for kinds in signatures(n):
+            tables[kinds] = build_table(kinds, tables, targets)
+            if progress:
+                progress(kinds, tables[kinds])
+        report[n] = (len(signatures(n)), sum(table.nbytes for kinds, table in tables.items() if len(kinds) == n),
+                     time.perf_counter() - start)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(f'{path}.tmp', 'wb') as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, pieces, len(tables)))
+        offset = HEADER.size + len(tables) * ENTRY.size
+        for kinds, table in tables.items():
+            f.write(ENTRY.pack(len(kinds), bytes(kinds).ljust(3, b'\xff'), offset))
+            offset += table.nbytes
+        for table in tables.values():
+            f.write(table.tobytes())
+    os.replace(f'{path}.tmp', path)
+    return report
+
+
+if __name__ == '__main__':
+    # Offline build: python -m minimax.tablebase [--pieces N] [--path FILE]
+    import argparse
+    import numpy as np
+
+    parser = argparse.ArgumentParser(description='Build the endgame tablebase.')
+    parser.add_argument('--pieces', type=int, default=MAX_PIECES, help='most pieces on the board')
+    parser.add_argument('--path', default=TABLEBASE_PATH)
+    args = parser.parse_args()
+
+    def progress(kinds, table):
+        plies = table[table > 0].astype(np.int64) - 1
+        name = ' '.join(('white ' if color == WHITE else 'red ') + type for color, type in (KINDS[kind] for kind in kinds))
+        print(f"{name}: {np.count_nonzero(plies % 2)} won, {np.count_nonzero(plies % 2 == 0)} lost, "
+              f"longest {plies.max(initial=0)} plies")
+
+    report = build_tablebase(args.path, args.pieces, progress)
+    for n, (count, size, seconds) in report.items():
+        print(f"{n} pieces: {count} tables, {size / 1024:.0f} KB, built in {seconds:.1f}s")
+    print(f"written to {args.path}")
@@ -0,0 +1,79 @@
+from copy import deepcopy
+from checkers.constants import RED, WHITE
+from checkers.zobrist import SIDE_TO_MOVE
+
+# Bound types for stored scores
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+class TranspositionTable:
+    """Fixed-size table of searched positions keyed by Zobrist hash.
+
+    Each key maps to one slot; a slot is overwritten when it holds the same
+    position, an entry from an older search, or a shallower (or equal) search.
+    """
+
+    def __init__(self, max_entries=1 << 18):
+        self.max_entries = max_entries
+        self.slots = [None] * max_entries
+        self.generation = 0
+        self.probes = self.hits = self.cutoffs = self.stores = 0
+
+    def key(self, board, max_player):
+        return board.hash ^ SIDE_TO_MOVE if max_player else board.hash
+
+    def new_search(self):
+        # Entries from earlier searches stay usable but may be replaced
+        self.generation += 1
+
+    def clear(self):
+        self.slots = [None] * self.max_entries
+        self.probes = self.hits = self.cutoffs = self.stores = 0
+
+    def probe(self, key):
+        """Return (depth, score, flag, best_move) for key, or None."""
+        self.probes += 1
+        entry = self.slots[key % self.max_entries]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry[1:5]
+        return None
+
+    def store(self, key, depth, score, flag, best_move):
+        index = key % self.max_entries
+        entry = self.slots[index]
+        if entry is None or entry[0] == key or entry[5] != self.generation or depth >= entry[1]:
+            self.slots[index] = (key, depth, score, flag, best_move, self.generation)
+            self.stores += 1
+
+    def principal_variation(self, board, max_player, length):
+        """The stored best moves from board onward, at most length of them.
+
+        Reads the slots directly so the probe counters are not disturbed, and
+        stops at a missing entry, a move that is not legal here, or a repeat.
+        """
+        board = deepcopy(board)
+        pv, seen = [], set()
+        for _ in range(length):
+            key = self.key(board, max_player)
+            entry = self.slots[key % self.max_entries]
+            if entry is None or entry[0] != key or key in seen:
+                break
+            move = entry[4]
+            if move not in board.get_move_list(WHITE if max_player else RED):
+                break
+            seen.add(key)
+            pv.append(move)
+            board.make_move(move)
+            max_player = not max_player
+        return pv
+
+    def hit_rate(self):
+        return self.hits / self.probes if self.probes else 0.0
+
+    def cutoff_rate(self):
+        return self.cutoffs / self.probes if self.probes else 0.0
+
+    def report(self):
+        return (f"TT probes={self.probes} hits={self.hits} ({self.hit_rate():.1%}) "
+                f"cutoffs={self.cutoffs} ({self.cutoff_rate():.1%}) stores={self.stores}")
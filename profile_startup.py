@@ -0,0 +1,50 @@
+import os
+import subprocess
+import sys
+import time
+
+# Import-time profile and time-to-first-frame for main.py.
+# Usage: python profile_startup.py [number of imports to list]
+
+FIRST_FRAME = """
+import time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+main.draw_opening_screen()
+print(imported - start, time.perf_counter() - start)
+"""
+
+
+def parse_importtime(stderr):
+    # -X importtime lines: "import time: self [us] | cumulative | imported package"
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        imports.append((int(cumulative_us), int(self_us), depth, name.strip()))
+    return imports
+
+
+def profile(top=15):
+    env = dict(os.environ, SDL_VIDEODRIVER='dummy', SDL_AUDIODRIVER='dummy', PYGAME_HIDE_SUPPORT_PROMPT='1')
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', FIRST_FRAME], cwd=os.path.dirname(os.path.abspath(__file__)),
+                            env=env, capture_output=True, text=True, check=True)
+    wall = time.perf_counter() - start
+    import_seconds, frame_seconds = map(float, result.stdout.split()[-2:])
+    imports = parse_importtime(result.stderr)
+
+    print(f"process start to first frame: {wall * 1000:.0f} ms")
+    print(f"  importing main:             {import_seconds * 1000:.0f} ms")
+    print(f"  import + first frame:       {frame_seconds * 1000:.0f} ms")
+    print("\ntop-level imports by cumulative time:")
+    for cumulative_us, self_us, depth, name in sorted((i for i in imports if i[2] <= 1), reverse=True)[:top]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+    return wall
+
+
+if __name__ == '__main__':
+    profile(int(sys.argv[1]) if len(sys.argv) > 1 else 15)